@@ -2,27 +2,108 @@
 
 from __future__ import annotations
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_DEVICE_ID, CONF_ENTITIES, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_ENTITIES,
+    SERVICE_TURN_OFF,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.device import (
     async_remove_stale_devices_links_keep_current_device,
 )
+from homeassistant.helpers.typing import ConfigType
+
+from .accumulator import RuntimeAccumulator, RuntimeStore, parse_speed_watts
+from .const import (
+    ATTR_SECONDS,
+    ATTR_TRACE_ALLOCATIONS,
+    CONF_DIMMER,
+    CONF_HIDE_MEMBERS,
+    CONF_SPEED_WATTS,
+    DOMAIN,
+    SERVICE_PROFILE,
+)
+from .members import MemberCommandBatcher, async_call_member_service
+from .models import SwitchFanData
+from .scheduler import TimerScheduler
+
+PLATFORMS = (Platform.FAN, Platform.SENSOR)
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SECONDS, default=60.0): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional(ATTR_TRACE_ALLOCATIONS, default=False): cv.boolean,
+    }
+)
 
-from .const import CONF_HIDE_MEMBERS
 
-PLATFORMS = (Platform.FAN,)
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Switch Fan integration."""
+
+    async def async_timers_expired(keys: list[str]) -> None:
+        """Turn off the fans whose timers expired, in as few calls as possible."""
+        fans = [
+            fan for key in keys if (fan := hass.data[DOMAIN].fans.get(key)) is not None
+        ]
+        await async_call_member_service(
+            hass,
+            SERVICE_TURN_OFF,
+            [entity_id for fan in fans for entity_id in fan.async_prepare_turn_off()],
+        )
+
+    async def async_handle_profile(call: ServiceCall) -> None:
+        """Profile the switch fans and write a report to the config directory."""
+        data: SwitchFanData = hass.data[DOMAIN]
+        if data.profiling:
+            raise HomeAssistantError("Switch Fan profiling is already running")
+        # Imported here so the profiler costs nothing until it is used
+        from .profiler import async_profile  # pylint: disable=import-outside-toplevel
+
+        data.profiling = True
+        try:
+            await async_profile(
+                hass, call.data[ATTR_SECONDS], call.data[ATTR_TRACE_ALLOCATIONS]
+            )
+        finally:
+            data.profiling = False
+
+    timers = TimerScheduler(hass, async_timers_expired)
+    await timers.async_load()
+    runtime = RuntimeStore(hass)
+    await runtime.async_load()
+    hass.data[DOMAIN] = SwitchFanData(
+        timers=timers, commands=MemberCommandBatcher(hass), runtime=runtime
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Switch Fan from a config entry."""
-
-    async_remove_stale_devices_links_keep_current_device(
+    speed_count = (
+        1 if entry.options.get(CONF_DIMMER) else len(entry.options[CONF_ENTITIES])
+    )
+    watts = entry.options.get(CONF_SPEED_WATTS)
+    entry.runtime_data = RuntimeAccumulator(
         hass,
+        hass.data[DOMAIN].runtime,
         entry.entry_id,
-        entry.options.get(CONF_DEVICE_ID),
+        speed_count,
+        parse_speed_watts(watts) if watts else None,
     )
+    entry.async_on_unload(entry.runtime_data.async_start())
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
@@ -31,6 +112,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Remove a config entry."""
+    if (data := hass.data.get(DOMAIN)) is not None:
+        data.timers.async_cancel(entry.entry_id)
+        data.runtime.async_remove(entry.entry_id)
+
     # Unhide the group members
     registry = er.async_get(hass)
 
@@ -50,6 +135,13 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
 
 async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update listener, called when the config entry options are changed."""
+    # Device links only go stale when the device is changed in the options,
+    # so they are not cleaned up on every start
+    async_remove_stale_devices_links_keep_current_device(
+        hass,
+        entry.entry_id,
+        entry.options.get(CONF_DEVICE_ID),
+    )
     await hass.config_entries.async_reload(entry.entry_id)
 
 
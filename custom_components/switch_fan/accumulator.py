@@ -0,0 +1,196 @@
+"""Runtime and energy accumulator for a switch fan."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.runtime"
+STORAGE_VERSION = 1
+CHECKPOINT_INTERVAL = timedelta(minutes=15)
+
+
+def parse_speed_watts(value: str) -> list[float]:
+    """Parse a comma separated list of watts, one per speed.
+
+    Raises ValueError if any of the values is not a number.
+    """
+    return [float(watts) for watts in value.split(",")]
+
+
+class RuntimeStore:
+    """Store the runtime totals of every switch fan together.
+
+    The totals of the running accumulators are read when the store is
+    written, so a save is only scheduled once per checkpoint interval and the
+    final write at shutdown includes the time run up to then.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, list[float]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._totals: dict[str, list[float]] = {}
+        self._accumulators: dict[str, RuntimeAccumulator] = {}
+        self._save_pending = False
+
+    async def async_load(self) -> None:
+        """Load the totals stored before the last restart."""
+        self._totals = await self._store.async_load() or {}
+
+    def seconds(self, entry_id: str) -> list[float]:
+        """Return the stored seconds run at each speed of a config entry."""
+        return self._totals.get(entry_id, [])
+
+    @callback
+    def async_add(
+        self, entry_id: str, accumulator: RuntimeAccumulator
+    ) -> CALLBACK_TYPE:
+        """Store the totals of an accumulator until the returned callback."""
+        self._accumulators[entry_id] = accumulator
+
+        @callback
+        def async_remove_accumulator() -> None:
+            del self._accumulators[entry_id]
+            self._totals[entry_id] = accumulator.async_totals()
+            self.async_schedule_save()
+
+        return async_remove_accumulator
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Remove the stored totals of a config entry."""
+        if self._totals.pop(entry_id, None) is not None:
+            self.async_schedule_save()
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Save the totals within the checkpoint interval."""
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(
+            self._data_to_save, CHECKPOINT_INTERVAL.total_seconds()
+        )
+
+    @callback
+    def _data_to_save(self) -> dict[str, list[float]]:
+        """Return the totals to store, up to date for running accumulators."""
+        self._save_pending = False
+        for entry_id, accumulator in self._accumulators.items():
+            self._totals[entry_id] = accumulator.async_totals()
+        return self._totals
+
+
+class RuntimeAccumulator:
+    """Accumulate how long a fan has run at each speed.
+
+    The fan reports every speed transition it observes, so totals are kept
+    without querying the recorder. They are checkpointed to storage on a low
+    frequency schedule and restored on start.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        runtime_store: RuntimeStore,
+        entry_id: str,
+        speed_count: int,
+        watts: list[float] | None = None,
+    ) -> None:
+        """Initialize the accumulator from the stored totals."""
+        self.hass = hass
+        self.speed_count = speed_count
+        self.watts = watts
+        self._runtime_store = runtime_store
+        self._entry_id = entry_id
+        self._seconds = [0.0] * speed_count
+        seconds = runtime_store.seconds(entry_id)[:speed_count]
+        self._seconds[: len(seconds)] = seconds
+        self._speed = 0
+        self._since = time.monotonic()
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start checkpointing the totals, and return a callback to stop."""
+        unsub_store = self._runtime_store.async_add(self._entry_id, self)
+        unsub_checkpoint = async_track_time_interval(
+            self.hass,
+            self._async_checkpoint,
+            CHECKPOINT_INTERVAL,
+            name="switch_fan runtime checkpoint",
+            cancel_on_shutdown=True,
+        )
+
+        @callback
+        def async_stop() -> None:
+            unsub_checkpoint()
+            unsub_store()
+
+        return async_stop
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for changes to the totals."""
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+    @callback
+    def async_transition(self, speed: int | None) -> None:
+        """Record the fan changing to the given speed, 0 or None when stopped."""
+        speed = speed or 0
+        if speed == self._speed:
+            return
+        self._async_flush()
+        self._speed = speed
+        self._runtime_store.async_schedule_save()
+        self._async_notify()
+
+    def hours(self, speed: int) -> float:
+        """Return the hours run at the given speed."""
+        seconds = self._seconds[speed - 1]
+        if speed == self._speed:
+            seconds += time.monotonic() - self._since
+        return seconds / 3600
+
+    def energy(self, speed: int) -> float | None:
+        """Return the energy used at the given speed in kWh."""
+        if self.watts is None:
+            return None
+        return self.hours(speed) * self.watts[speed - 1] / 1000
+
+    @callback
+    def _async_flush(self) -> None:
+        """Add the time since the last flush to the current speed."""
+        now = time.monotonic()
+        if self._speed:
+            self._seconds[self._speed - 1] += now - self._since
+        self._since = now
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify listeners that the totals changed."""
+        for update_callback in self._listeners:
+            update_callback()
+
+    @callback
+    def _async_checkpoint(self, _now: datetime) -> None:
+        """Refresh the totals of a running fan and schedule saving them."""
+        if self._speed:
+            self._runtime_store.async_schedule_save()
+            self._async_notify()
+
+    @callback
+    def async_totals(self) -> list[float]:
+        """Return the seconds run at each speed, up to now."""
+        self._async_flush()
+        return list(self._seconds)
@@ -7,31 +7,101 @@ from typing import Any, cast
 
 import voluptuous as vol
 
-from homeassistant.components.input_boolean import DOMAIN as INPUT_BOOLEAN_DOMAIN
-from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
-from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.config_entries import ConfigFlowResult
 from homeassistant.const import CONF_DEVICE_ID, CONF_ENTITIES, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er, selector
 from homeassistant.helpers.schema_config_entry_flow import (
+    SchemaCommonFlowHandler,
     SchemaConfigFlowHandler,
+    SchemaFlowError,
     SchemaFlowFormStep,
     SchemaFlowMenuStep,
 )
 
-from .const import CONF_HIDE_MEMBERS, DOMAIN
+from .accumulator import parse_speed_watts
+from .const import (
+    CONF_AUTO_HYSTERESIS,
+    CONF_AUTO_SENSOR,
+    CONF_AUTO_THRESHOLDS,
+    CONF_BATCH_COMMANDS,
+    CONF_BRIGHTNESS_CURVE,
+    CONF_DIMMER,
+    CONF_DIRECTION_ENTITY,
+    CONF_HIDE_MEMBERS,
+    CONF_MAX_BRIGHTNESS,
+    CONF_MIN_BRIGHTNESS,
+    CONF_OSCILLATION_ENTITY,
+    CONF_RAMP_INTERVAL,
+    CONF_SPEED_CURVE,
+    CONF_SPEED_WATTS,
+    DEFAULT_MAX_BRIGHTNESS,
+    DEFAULT_MIN_BRIGHTNESS,
+    DOMAIN,
+    LIGHT_DOMAIN,
+    MEMBER_DOMAINS,
+    SENSOR_DOMAIN,
+)
+from .speeds import parse_speed_curve, parse_thresholds
+
+BRIGHTNESS_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=1,
+        max=100,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+        unit_of_measurement="%",
+    )
+)
+
+MEMBER_SELECTOR = selector.EntitySelector(
+    selector.EntitySelectorConfig(domain=MEMBER_DOMAINS)
+)
 
 OPTIONS_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_ENTITIES): selector.EntitySelector(
             selector.EntitySelectorConfig(
-                domain=[INPUT_BOOLEAN_DOMAIN, LIGHT_DOMAIN, SWITCH_DOMAIN],
+                domain=MEMBER_DOMAINS,
                 multiple=True,
             )
         ),
         vol.Required(CONF_HIDE_MEMBERS, default=False): selector.BooleanSelector(),
         vol.Optional(CONF_DEVICE_ID): selector.DeviceSelector(),
+        vol.Optional(CONF_RAMP_INTERVAL): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0,
+                max=60,
+                step=0.1,
+                mode=selector.NumberSelectorMode.BOX,
+                unit_of_measurement="s",
+            )
+        ),
+        vol.Optional(CONF_DIMMER): selector.BooleanSelector(),
+        vol.Optional(CONF_MIN_BRIGHTNESS): BRIGHTNESS_SELECTOR,
+        vol.Optional(CONF_MAX_BRIGHTNESS): BRIGHTNESS_SELECTOR,
+        vol.Optional(CONF_BRIGHTNESS_CURVE): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0.2,
+                max=5,
+                step=0.1,
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Optional(CONF_SPEED_WATTS): selector.TextSelector(),
+        vol.Optional(CONF_SPEED_CURVE): selector.TextSelector(),
+        vol.Optional(CONF_BATCH_COMMANDS): selector.BooleanSelector(),
+        vol.Optional(CONF_DIRECTION_ENTITY): MEMBER_SELECTOR,
+        vol.Optional(CONF_OSCILLATION_ENTITY): MEMBER_SELECTOR,
+        vol.Optional(CONF_AUTO_SENSOR): selector.EntitySelector(
+            selector.EntitySelectorConfig(domain=SENSOR_DOMAIN)
+        ),
+        vol.Optional(CONF_AUTO_THRESHOLDS): selector.TextSelector(),
+        vol.Optional(CONF_AUTO_HYSTERESIS): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=0, step="any", mode=selector.NumberSelectorMode.BOX
+            )
+        ),
     }
 )
 
@@ -41,12 +111,60 @@ CONFIG_SCHEMA = vol.Schema(
     }
 ).extend(OPTIONS_SCHEMA.schema)
 
+
+async def validate_options(
+    handler: SchemaCommonFlowHandler, user_input: dict[str, Any]
+) -> dict[str, Any]:
+    """Validate the members suit the selected speed control."""
+    if user_input.get(CONF_DIMMER):
+        if CONF_DIRECTION_ENTITY in user_input or CONF_OSCILLATION_ENTITY in user_input:
+            raise SchemaFlowError("dimmer_motion_unsupported")
+        entities = user_input[CONF_ENTITIES]
+        if len(entities) != 1 or not entities[0].startswith(f"{LIGHT_DOMAIN}."):
+            raise SchemaFlowError("dimmer_requires_single_light")
+        if user_input.get(
+            CONF_MIN_BRIGHTNESS, DEFAULT_MIN_BRIGHTNESS
+        ) >= user_input.get(CONF_MAX_BRIGHTNESS, DEFAULT_MAX_BRIGHTNESS):
+            raise SchemaFlowError("invalid_brightness_range")
+    if CONF_SPEED_WATTS in user_input:
+        try:
+            watts = parse_speed_watts(user_input[CONF_SPEED_WATTS])
+        except ValueError as err:
+            raise SchemaFlowError("invalid_speed_watts") from err
+        speed_count = (
+            1 if user_input.get(CONF_DIMMER) else len(user_input[CONF_ENTITIES])
+        )
+        if len(watts) != speed_count:
+            raise SchemaFlowError("invalid_speed_watts")
+    if CONF_SPEED_CURVE in user_input:
+        if user_input.get(CONF_DIMMER):
+            raise SchemaFlowError("invalid_speed_curve")
+        try:
+            percentages = parse_speed_curve(user_input[CONF_SPEED_CURVE])
+        except ValueError as err:
+            raise SchemaFlowError("invalid_speed_curve") from err
+        if len(percentages) != len(user_input[CONF_ENTITIES]):
+            raise SchemaFlowError("invalid_speed_curve")
+    if (CONF_AUTO_SENSOR in user_input) != (CONF_AUTO_THRESHOLDS in user_input):
+        raise SchemaFlowError("auto_requires_sensor_and_thresholds")
+    if CONF_AUTO_THRESHOLDS in user_input:
+        try:
+            thresholds = parse_thresholds(user_input[CONF_AUTO_THRESHOLDS])
+        except ValueError as err:
+            raise SchemaFlowError("invalid_auto_thresholds") from err
+        if not user_input.get(CONF_DIMMER) and len(thresholds) > len(
+            user_input[CONF_ENTITIES]
+        ):
+            raise SchemaFlowError("invalid_auto_thresholds")
+    return user_input
+
+
 CONFIG_FLOW: dict[str, SchemaFlowFormStep | SchemaFlowMenuStep] = {
-    "user": SchemaFlowFormStep(CONFIG_SCHEMA)
+    "user": SchemaFlowFormStep(CONFIG_SCHEMA, validate_user_input=validate_options)
 }
 
 OPTIONS_FLOW: dict[str, SchemaFlowFormStep | SchemaFlowMenuStep] = {
-    "init": SchemaFlowFormStep(OPTIONS_SCHEMA)
+    "init": SchemaFlowFormStep(OPTIONS_SCHEMA, validate_user_input=validate_options)
 }
 
 
@@ -3,3 +3,47 @@
 DOMAIN = "switch_fan"
 
 CONF_HIDE_MEMBERS = "hide_members"
+CONF_RAMP_INTERVAL = "ramp_interval"
+CONF_DIMMER = "dimmer"
+CONF_MIN_BRIGHTNESS = "min_brightness"
+CONF_MAX_BRIGHTNESS = "max_brightness"
+CONF_BRIGHTNESS_CURVE = "brightness_curve"
+CONF_SPEED_WATTS = "speed_watts"
+CONF_SPEED_CURVE = "speed_curve"
+CONF_DIRECTION_ENTITY = "direction_entity"
+CONF_OSCILLATION_ENTITY = "oscillation_entity"
+CONF_BATCH_COMMANDS = "batch_commands"
+CONF_AUTO_SENSOR = "auto_sensor"
+CONF_AUTO_THRESHOLDS = "auto_thresholds"
+CONF_AUTO_HYSTERESIS = "auto_hysteresis"
+
+DEFAULT_MIN_BRIGHTNESS = 1
+DEFAULT_MAX_BRIGHTNESS = 100
+DEFAULT_BRIGHTNESS_CURVE = 1.0
+DEFAULT_AUTO_HYSTERESIS = 0.0
+
+ATTR_BRIGHTNESS = "brightness"
+ATTR_DURATION = "duration"
+ATTR_FINISHES_AT = "finishes_at"
+ATTR_RAMP_TARGET = "ramp_target"
+ATTR_REMAINING = "remaining"
+ATTR_TRANSITION = "transition"
+
+PRESET_AUTO = "auto"
+
+SERVICE_PROFILE = "profile"
+SERVICE_SET_MOTION = "set_motion"
+SERVICE_SET_TIMER = "set_timer"
+
+ATTR_SECONDS = "seconds"
+ATTR_TRACE_ALLOCATIONS = "trace_allocations"
+
+# Member domains are defined here rather than imported from their components
+# so that loading the integration does not import those components as well.
+INPUT_BOOLEAN_DOMAIN = "input_boolean"
+LIGHT_DOMAIN = "light"
+SWITCH_DOMAIN = "switch"
+
+MEMBER_DOMAINS = [INPUT_BOOLEAN_DOMAIN, LIGHT_DOMAIN, SWITCH_DOMAIN]
+
+SENSOR_DOMAIN = "sensor"
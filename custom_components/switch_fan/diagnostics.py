@@ -0,0 +1,22 @@
+"""Diagnostics support for Switch Fan."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    diagnostics: dict[str, Any] = {"options": dict(entry.options)}
+    if (fan := hass.data[DOMAIN].fans.get(entry.entry_id)) is not None:
+        diagnostics["entity_states"] = fan.members.as_dict()
+        diagnostics["watchdog"] = fan.watchdog.as_dict()
+        diagnostics["trace"] = fan.trace.as_list()
+    return diagnostics
@@ -2,34 +2,84 @@
 
 from __future__ import annotations
 
-import math
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any
 
-from homeassistant.components.fan import FanEntity, FanEntityFeature
+import voluptuous as vol
+
+from homeassistant.components.fan import (
+    ATTR_DIRECTION,
+    ATTR_OSCILLATING,
+    ATTR_PERCENTAGE,
+    DIRECTION_FORWARD,
+    DIRECTION_REVERSE,
+    SERVICE_SET_PRESET_MODE,
+    FanEntity,
+    FanEntityFeature,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    ATTR_STATE,
     CONF_DEVICE_ID,
     CONF_ENTITIES,
-    CONF_ENTITY_ID,
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
+    STATE_OFF,
     STATE_ON,
 )
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import entity_registry as er
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, State, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    config_validation as cv,
+    entity_platform,
+    entity_registry as er,
+)
 from homeassistant.helpers.device import async_device_info_to_link_from_device_id
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
     Event,
     EventStateChangedData,
+    async_call_later,
     async_track_state_change_event,
 )
-from homeassistant.util.percentage import (
-    percentage_to_ranged_value,
-    ranged_value_to_percentage,
+from homeassistant.util import dt as dt_util
+
+from .accumulator import RuntimeAccumulator
+from .const import (
+    ATTR_BRIGHTNESS,
+    ATTR_DURATION,
+    ATTR_FINISHES_AT,
+    ATTR_RAMP_TARGET,
+    ATTR_REMAINING,
+    ATTR_TRANSITION,
+    CONF_AUTO_HYSTERESIS,
+    CONF_AUTO_SENSOR,
+    CONF_AUTO_THRESHOLDS,
+    CONF_BATCH_COMMANDS,
+    CONF_BRIGHTNESS_CURVE,
+    CONF_DIMMER,
+    CONF_DIRECTION_ENTITY,
+    CONF_MAX_BRIGHTNESS,
+    CONF_MIN_BRIGHTNESS,
+    CONF_OSCILLATION_ENTITY,
+    CONF_RAMP_INTERVAL,
+    CONF_SPEED_CURVE,
+    DEFAULT_AUTO_HYSTERESIS,
+    DEFAULT_BRIGHTNESS_CURVE,
+    DEFAULT_MAX_BRIGHTNESS,
+    DEFAULT_MIN_BRIGHTNESS,
+    DOMAIN,
+    PRESET_AUTO,
+    SERVICE_SET_MOTION,
+    SERVICE_SET_TIMER,
 )
+from .members import MemberStates, async_call_member_service
+from .models import TRACE_COMMAND, TRACE_EVENT, TRACE_REQUEST, FanTrace, SwitchFanData
+from .speeds import AutoBands, SpeedCurve, parse_speed_curve, parse_thresholds
+from .watchdog import CONFIRM_TIMEOUT, DriftWatchdog
 
 
 async def async_setup_entry(
@@ -51,16 +101,97 @@ async def async_setup_entry(
         config_entry.options.get(CONF_DEVICE_ID),
     )
 
-    async_add_entities(
-        [
-            SwitchFan(
-                unique_id=unique_id,
-                name=name,
-                entity_ids=entity_ids,
-                device_info=device_info,
-            )
-        ]
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SET_TIMER,
+        {vol.Required(ATTR_DURATION): cv.time_period},
+        "async_set_timer",
     )
+    platform.async_register_entity_service(
+        SERVICE_SET_MOTION,
+        {
+            vol.Optional(ATTR_PERCENTAGE): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=100)
+            ),
+            vol.Optional(ATTR_DIRECTION): vol.In(
+                [DIRECTION_FORWARD, DIRECTION_REVERSE]
+            ),
+            vol.Optional(ATTR_OSCILLATING): cv.boolean,
+        },
+        "async_set_motion",
+    )
+
+    dimmer = config_entry.options.get(CONF_DIMMER, False)
+    auto_bands = None
+    if thresholds := config_entry.options.get(CONF_AUTO_THRESHOLDS):
+        auto_bands = AutoBands(
+            parse_thresholds(thresholds),
+            DimmerFan.SPEED_COUNT if dimmer else len(entity_ids),
+            config_entry.options.get(CONF_AUTO_HYSTERESIS, DEFAULT_AUTO_HYSTERESIS),
+        )
+
+    speed_curve = None
+    if curve := config_entry.options.get(CONF_SPEED_CURVE):
+        speed_curve = SpeedCurve(parse_speed_curve(curve))
+
+    fan: SwitchFan
+    if dimmer:
+        fan = DimmerFan(
+            unique_id=unique_id,
+            name=name,
+            entity_ids=entity_ids,
+            device_info=device_info,
+            ramp_interval=config_entry.options.get(CONF_RAMP_INTERVAL, 0),
+            runtime=config_entry.runtime_data,
+            batch_commands=config_entry.options.get(CONF_BATCH_COMMANDS, False),
+            auto_sensor=config_entry.options.get(CONF_AUTO_SENSOR),
+            auto_bands=auto_bands,
+            min_brightness=config_entry.options.get(
+                CONF_MIN_BRIGHTNESS, DEFAULT_MIN_BRIGHTNESS
+            ),
+            max_brightness=config_entry.options.get(
+                CONF_MAX_BRIGHTNESS, DEFAULT_MAX_BRIGHTNESS
+            ),
+            curve=config_entry.options.get(
+                CONF_BRIGHTNESS_CURVE, DEFAULT_BRIGHTNESS_CURVE
+            ),
+        )
+    else:
+        fan = SwitchFan(
+            unique_id=unique_id,
+            name=name,
+            entity_ids=entity_ids,
+            device_info=device_info,
+            ramp_interval=config_entry.options.get(CONF_RAMP_INTERVAL, 0),
+            runtime=config_entry.runtime_data,
+            batch_commands=config_entry.options.get(CONF_BATCH_COMMANDS, False),
+            auto_sensor=config_entry.options.get(CONF_AUTO_SENSOR),
+            auto_bands=auto_bands,
+            speed_curve=speed_curve,
+            direction_entity=config_entry.options.get(CONF_DIRECTION_ENTITY),
+            oscillation_entity=config_entry.options.get(CONF_OSCILLATION_ENTITY),
+        )
+
+    async_add_entities([fan])
+
+
+@dataclass(slots=True)
+class SpeedRamp:
+    """In progress transition through intermediate speeds."""
+
+    target: int
+    index: int
+    unsub: CALLBACK_TYPE | None = None
+
+
+@dataclass(slots=True)
+class CommandStep:
+    """Member commands sent together, one call per service and domain."""
+
+    turn_on: list[str] = field(default_factory=list)
+    turn_off: list[str] = field(default_factory=list)
+    # The speed the step commands, for the watchdog
+    speed: int | None = None
 
 
 class SwitchFan(FanEntity):
@@ -74,90 +205,226 @@ class SwitchFan(FanEntity):
         name: str,
         entity_ids: list[str],
         device_info: DeviceInfo | None,
+        ramp_interval: float = 0,
+        runtime: RuntimeAccumulator | None = None,
+        batch_commands: bool = False,
+        auto_sensor: str | None = None,
+        auto_bands: AutoBands | None = None,
+        speed_curve: SpeedCurve | None = None,
+        direction_entity: str | None = None,
+        oscillation_entity: str | None = None,
     ) -> None:
         """Initialize the fan entity."""
         features = FanEntityFeature.TURN_ON | FanEntityFeature.TURN_OFF
         # If we have more than 1 entity then we can set multiple speeds
         if len(entity_ids) > 1:
             features |= FanEntityFeature.SET_SPEED
-        self.entity_ids = entity_ids
-        self.entity_states = {}
+        if auto_sensor is not None and auto_bands is not None:
+            features |= FanEntityFeature.PRESET_MODE
+            self._attr_preset_modes = [PRESET_AUTO]
+        if direction_entity is not None:
+            features |= FanEntityFeature.DIRECTION
+        if oscillation_entity is not None:
+            features |= FanEntityFeature.OSCILLATE
+        self.members = MemberStates(entity_ids)
+        self.trace = FanTrace()
         self._attr_unique_id = unique_id
         self._attr_name = name
         self._attr_speed_count = len(entity_ids)
+        self._speed_curve = speed_curve or SpeedCurve.linear(len(entity_ids))
         self._attr_supported_features = features
         self._attr_device_info = device_info
+        self._runtime = runtime
+        self._batch_commands = batch_commands
+        self._auto_sensor = auto_sensor
+        self._auto_bands = auto_bands
+        self._auto_band: int | None = None
+        self._unsub_auto: CALLBACK_TYPE | None = None
+        self._direction_entity = direction_entity
+        self._oscillation_entity = oscillation_entity
+        self._stopped: asyncio.Future[None] | None = None
+        self._unsub_track: CALLBACK_TYPE | None = None
+        self._ramp_interval = ramp_interval
+        self._ramp: SpeedRamp | None = None
+        self._ramp_job = HassJob(
+            self._async_ramp_step, "switch_fan ramp step", cancel_on_shutdown=True
+        )
 
-    async def call_service(self, service_name: str, entity_ids: list[str]) -> None:
+    @property
+    def entity_ids(self) -> tuple[str, ...]:
+        """Return the entity IDs of the members, slowest to fastest."""
+        return self.members.entity_ids
+
+    @property
+    def data(self) -> SwitchFanData:
+        """Return the data shared by all switch fans."""
+        return self.hass.data[DOMAIN]
+
+    async def call_service(
+        self,
+        service_name: str,
+        entity_ids: Iterable[str],
+        service_data: dict[str, Any] | None = None,
+    ) -> None:
         """Call service for the given entity IDs.
 
-        Batches entities by their domain to minimize service calls.
+        Batches entities by their domain to minimize service calls, and with
+        the calls of other fans in the same loop tick when enabled.
         """
-        groups = {}
-        for entity_id in entity_ids:
-            domain, *_ = entity_id.split(".", 1)
-            if domain in groups:
-                groups[domain].add(entity_id)
-            else:
-                groups[domain] = {
-                    entity_id,
-                }
-        for domain, sub_entity_ids in groups.items():
-            await self.hass.services.async_call(
-                domain=domain,
-                service=service_name,
-                service_data={
-                    CONF_ENTITY_ID: sub_entity_ids,
-                },
-            )
+        entity_ids = tuple(entity_ids)
+        if entity_ids:
+            self.trace.record(TRACE_COMMAND, service_name, entity_ids, service_data)
+        await self._async_send(service_name, entity_ids, service_data)
+
+    async def _async_send(
+        self,
+        service_name: str,
+        entity_ids: tuple[str, ...],
+        service_data: dict[str, Any] | None = None,
+    ) -> None:
+        """Send a member command that has already been traced."""
+        if self._batch_commands:
+            await self.data.commands.async_call(service_name, entity_ids, service_data)
+            return
+        await async_call_member_service(
+            self.hass, service_name, entity_ids, service_data
+        )
 
     def refresh_entity_states(self):
-        """Refresh entity states."""
-        self.entity_states = {
-            entity_id: getattr(self.hass.states.get(entity_id), ATTR_STATE, None)
-            for entity_id in self.entity_ids
-        }
-        self.async_write_ha_state()
+        """Refresh entity states.
+
+        The state is not written, as the platform writes it once the entity
+        has been added.
+        """
+        self.members.refresh(self.hass.states)
+        if self._runtime is not None:
+            self._runtime.async_transition(self.runtime_speed)
 
     async def async_added_to_hass(self) -> None:
         """Entity added to HASS."""
+        self.watchdog = DriftWatchdog(
+            self.hass,
+            self.entity_id,
+            self.is_speed_settled,
+            self.async_correct_speed_index,
+        )
+        self.async_on_remove(self.watchdog.async_cancel)
         self.refresh_entity_states()
-        self.async_on_remove(
-            async_track_state_change_event(
-                self.hass,
-                self.entity_ids,
-                self.async_update_event_state_callback,
-            )
+        self.async_track_members()
+        self.async_on_remove(self.async_cancel_ramp)
+        self.data.fans[self.unique_id] = self
+        self.data.timers.async_restore(self.unique_id)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Entity being removed from HASS."""
+        self.data.fans.pop(self.unique_id, None)
+        if self._unsub_track is not None:
+            self._unsub_track()
+            self._unsub_track = None
+        if self._unsub_auto is not None:
+            self._unsub_auto()
+            self._unsub_auto = None
+
+    @callback
+    def async_track_members(self) -> None:
+        """Listen for state changes of the members.
+
+        Subscribing again binds the listener to the current callback, which
+        lets the profiler instrument fans that are already running.
+        """
+        if self._unsub_track is not None:
+            self._unsub_track()
+        self._unsub_track = async_track_state_change_event(
+            self.hass,
+            [
+                *self.entity_ids,
+                *(
+                    entity_id
+                    for entity_id in (self._direction_entity, self._oscillation_entity)
+                    if entity_id is not None
+                ),
+            ],
+            self.async_update_event_state_callback,
         )
 
     @callback
     def async_update_event_state_callback(self, event: Event[EventStateChangedData]):
         """Watched entity's state has changed."""
         entity_id = event.data["entity_id"]
-        self.entity_states[entity_id] = event.data["new_state"].state
+        new_state = event.data["new_state"]
+        if new_state is None:
+            self.members.set(entity_id, None)
+            self.trace.record(TRACE_EVENT, entity_id, None, None)
+        else:
+            self.members.set(entity_id, new_state.state)
+            self.trace.record(
+                TRACE_EVENT,
+                entity_id,
+                new_state.state,
+                new_state.attributes.get(ATTR_BRIGHTNESS),
+            )
+        self.watchdog.async_check()
+        if (stopped := self._stopped) is not None and self.is_speed_settled(0):
+            self._stopped = None
+            stopped.set_result(None)
+        if self._runtime is not None:
+            self._runtime.async_transition(self.runtime_speed)
         self.async_write_ha_state()
 
     @property
-    def percentage(self) -> int | None:
-        """Calculate the fan speed percentage based off entity states.
+    def speed_index(self) -> int | None:
+        """Return the active speed, from 1 to the speed count, or 0 when off.
 
         The entity that is ON is deemed the active entity. It's index in the
-        list of entities is used to determine the speed percentage.
+        list of entities is used to determine the speed.
         """
-        if len(self.entity_states) != len(self.entity_ids):
+        return self.members.active_speed()
+
+    @property
+    def runtime_speed(self) -> int | None:
+        """Return the speed runtime is accumulated for."""
+        return self.speed_index
+
+    @property
+    def percentage(self) -> int | None:
+        """Calculate the fan speed percentage based off entity states."""
+        if (speed_index := self.speed_index) is None:
             return None
-        active_id = next(
-            (
-                entity_id
-                for entity_id, state in self.entity_states.items()
-                if state == STATE_ON
-            ),
-            None,
-        )
-        if active_id is None:
-            return 0
-        speed_index = self.entity_ids.index(active_id) + 1
-        return ranged_value_to_percentage(self.speed_range, speed_index)
+        return self._speed_curve.percentage(speed_index)
+
+    @property
+    def current_direction(self) -> str | None:
+        """Return the direction, reverse while the direction entity is on."""
+        if (is_on := self._aux_is_on(self._direction_entity)) is None:
+            return None
+        return DIRECTION_REVERSE if is_on else DIRECTION_FORWARD
+
+    @property
+    def oscillating(self) -> bool | None:
+        """Return if the oscillation entity is on."""
+        return self._aux_is_on(self._oscillation_entity)
+
+    def _aux_is_on(self, entity_id: str | None) -> bool | None:
+        """Return if a direction or oscillation entity is on."""
+        if entity_id is None or (state := self.hass.states.get(entity_id)) is None:
+            return None
+        if state.state not in (STATE_ON, STATE_OFF):
+            return None
+        return state.state == STATE_ON
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes of an in progress ramp or timer."""
+        attributes: dict[str, Any] = {}
+        if self._ramp is not None:
+            attributes[ATTR_RAMP_TARGET] = self._speed_curve.percentage(
+                self._ramp.target
+            )
+        if (finishes_at := self.data.timers.deadline(self.unique_id)) is not None:
+            remaining = (finishes_at - dt_util.utcnow()).total_seconds()
+            attributes[ATTR_REMAINING] = str(timedelta(seconds=max(int(remaining), 0)))
+            attributes[ATTR_FINISHES_AT] = finishes_at.isoformat()
+        return attributes or None
 
     @property
     def speed_range(self) -> tuple[int, int]:
@@ -168,26 +435,326 @@ class SwitchFan(FanEntity):
         """Set the fan speed by percentage.
 
         The percentage is converted to a index used to select the active
-        entity from the list of entities.
+        entity from the list of entities, following the speed curve.
         """
         if percentage == 0:
             await self.async_turn_off()
             return
-        value = math.ceil(percentage_to_ranged_value(self.speed_range, percentage))
-        index = value - 1
-        entity_id = self.entity_ids[index]
-        await self.call_service(SERVICE_TURN_ON, [entity_id])
-        await self.call_service(
-            SERVICE_TURN_OFF,
-            [eid for eid in self.entity_ids if eid != entity_id],
+        self.trace.record(TRACE_REQUEST, percentage)
+        self.async_cancel_auto()
+        await self._async_set_speed(self._speed_curve.speed(percentage))
+
+    async def _async_set_speed(self, value: int) -> None:
+        """Change to the speed, through the speeds between when ramping."""
+        self.async_cancel_ramp()
+        current = self.speed_index or 0
+        if self._ramp_interval and abs(value - current) > 1:
+            self._ramp = SpeedRamp(target=value, index=current)
+            await self._async_ramp_step()
+            return
+        await self.async_set_speed_index(value)
+
+    async def async_set_speed_index(self, speed_index: int) -> None:
+        """Turn on the entity for the given speed and turn off the rest."""
+        step = CommandStep()
+        self._plan_speed(step, speed_index)
+        await self._async_run_plan([step])
+
+    def _plan_speed(self, step: CommandStep, speed_index: int) -> None:
+        """Add turning on only the entity for the given speed to a step."""
+        step.speed = speed_index
+        for index, member in enumerate(self.members.members, 1):
+            if index == speed_index:
+                step.turn_on.append(member.entity_id)
+            else:
+                step.turn_off.append(member.entity_id)
+
+    def plan_motion(
+        self,
+        speed_index: int | None = None,
+        direction: str | None = None,
+        oscillating: bool | None = None,
+    ) -> list[CommandStep]:
+        """Return the ordered steps to change the speed, direction and oscillation.
+
+        Changes that are safe together are sent as one step. Reversing stops
+        the fan first, then changes the direction and only then restarts the
+        fan, at its previous speed unless another is given.
+        """
+        step = CommandStep()
+        steps = [step]
+        current = self.speed_index or 0
+        if (
+            direction is not None
+            and self._direction_entity is not None
+            and direction != self.current_direction
+        ):
+            if current:
+                steps.insert(0, CommandStep(turn_off=list(self.entity_ids), speed=0))
+                if speed_index is None:
+                    speed_index = current
+            target = step.turn_on if direction == DIRECTION_REVERSE else step.turn_off
+            target.append(self._direction_entity)
+            if speed_index:
+                restart = CommandStep()
+                self._plan_speed(restart, speed_index)
+                steps.append(restart)
+            # The fan is stopped, or restarted once the direction changed
+            speed_index = None
+        if (
+            oscillating is not None
+            and self._oscillation_entity is not None
+            and oscillating != self.oscillating
+        ):
+            (step.turn_on if oscillating else step.turn_off).append(
+                self._oscillation_entity
+            )
+        if speed_index:
+            self._plan_speed(step, speed_index)
+        elif speed_index == 0:
+            step.speed = 0
+            step.turn_off.extend(self.entity_ids)
+        return [step for step in steps if step.turn_on or step.turn_off]
+
+    async def _async_run_plan(self, steps: list[CommandStep]) -> None:
+        """Send the steps of a plan in order.
+
+        A step stopping the fan before others is only followed once the
+        members report the fan stopped.
+        """
+        for index, step in enumerate(steps, 1):
+            if step.speed is not None:
+                self.watchdog.async_commanded(step.speed)
+            await self.call_service(SERVICE_TURN_ON, step.turn_on)
+            await self.call_service(SERVICE_TURN_OFF, step.turn_off)
+            if step.speed == 0 and index < len(steps):
+                await self._async_wait_stopped()
+
+    async def _async_wait_stopped(self) -> None:
+        """Wait for the members to report the fan stopped."""
+        if self.is_speed_settled(0):
+            return
+        self._stopped = self.hass.loop.create_future()
+        try:
+            async with asyncio.timeout(CONFIRM_TIMEOUT):
+                await self._stopped
+        except TimeoutError as err:
+            raise HomeAssistantError(
+                f"{self.entity_id} did not stop, so its direction was not changed"
+            ) from err
+        finally:
+            self._stopped = None
+
+    async def async_set_direction(self, direction: str) -> None:
+        """Set the direction of the fan, stopping it first to reverse."""
+        await self.async_set_motion(direction=direction)
+
+    async def async_oscillate(self, oscillating: bool) -> None:
+        """Turn oscillation on or off."""
+        await self.async_set_motion(oscillating=oscillating)
+
+    async def async_set_motion(
+        self,
+        percentage: int | None = None,
+        direction: str | None = None,
+        oscillating: bool | None = None,
+    ) -> None:
+        """Set the speed, direction and oscillation as one ordered command."""
+        self.trace.record(
+            TRACE_REQUEST,
+            percentage,
+            SERVICE_SET_MOTION,
+            None,
+            direction,
+            oscillating,
         )
+        speed_index = None
+        if percentage is not None:
+            self.async_cancel_auto()
+            speed_index = self._speed_curve.speed(percentage)
+            if not speed_index:
+                self.data.timers.async_cancel(self.unique_id)
+        if speed_index is not None or direction is not None:
+            self.async_cancel_ramp()
+        ramp_to = None
+        if self._ramp_interval:
+            reversing = (
+                direction is not None
+                and self._direction_entity is not None
+                and direction != self.current_direction
+            )
+            if reversing and speed_index is None:
+                speed_index = self.speed_index or 0
+            if speed_index:
+                # Ramp to the speed once the direction and oscillation are set
+                ramp_to = speed_index
+                speed_index = 0 if reversing else None
+        await self._async_run_plan(
+            self.plan_motion(speed_index, direction, oscillating)
+        )
+        if ramp_to is not None:
+            await self._async_set_speed(ramp_to)
+
+    def is_speed_settled(self, speed_index: int) -> bool:
+        """Return if only the entity for the given speed is on."""
+        return self.members.is_only_on(speed_index)
+
+    async def async_correct_speed_index(self, speed_index: int) -> None:
+        """Turn on or off only the entities that differ from the given speed."""
+        turn_on = []
+        turn_off = []
+        for index, member in enumerate(self.members.members, 1):
+            is_on = self.members.is_on(index)
+            if index == speed_index and not is_on:
+                turn_on.append(member.entity_id)
+            elif index != speed_index and is_on:
+                turn_off.append(member.entity_id)
+        await self.call_service(SERVICE_TURN_ON, turn_on)
+        await self.call_service(SERVICE_TURN_OFF, turn_off)
+
+    async def _async_ramp_step(self, _now: datetime | None = None) -> None:
+        """Move the ramp one speed closer to its target."""
+        if (ramp := self._ramp) is None:
+            return
+        ramp.unsub = None
+        ramp.index += 1 if ramp.target > ramp.index else -1
+        if ramp.index == ramp.target:
+            self._ramp = None
+        try:
+            await self.async_set_speed_index(ramp.index)
+        except Exception:
+            # Nothing arms the next step, so do not report a ramp in progress
+            if self._ramp is ramp:
+                self._ramp = None
+                self.async_write_ha_state()
+            raise
+        # A newer command replaces the ramp while its step is being sent
+        if self._ramp is ramp:
+            ramp.unsub = async_call_later(
+                self.hass, self._ramp_interval, self._ramp_job
+            )
+
+    @callback
+    def async_cancel_ramp(self) -> None:
+        """Cancel an in progress speed ramp."""
+        if (ramp := self._ramp) is None:
+            return
+        self._ramp = None
+        if ramp.unsub is not None:
+            ramp.unsub()
+
+    async def async_set_timer(self, duration: timedelta) -> None:
+        """Turn off the fan once the duration has elapsed.
+
+        A duration of zero cancels the timer.
+        """
+        if duration:
+            self.data.timers.async_set(self.unique_id, duration)
+        else:
+            self.data.timers.async_cancel(self.unique_id)
+        self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the fan.
 
         Turns off all entities.
         """
-        await self.call_service(SERVICE_TURN_OFF, self.entity_ids)
+        await self._async_send(SERVICE_TURN_OFF, self.async_prepare_turn_off())
+
+    @callback
+    def async_prepare_turn_off(self) -> tuple[str, ...]:
+        """Handle a request to turn off and return the members to turn off.
+
+        The caller turns the members off, which lets expired timers turn off
+        many fans with one call.
+        """
+        self.trace.record(TRACE_REQUEST, 0)
+        self.async_cancel_auto()
+        self.data.timers.async_cancel(self.unique_id)
+        entity_ids = self._async_prepare_stop()
+        # The timer attributes are gone before the members report back
+        self.async_write_ha_state()
+        return entity_ids
+
+    async def _async_stop(self) -> None:
+        """Turn off all entities."""
+        await self._async_send(SERVICE_TURN_OFF, self._async_prepare_stop())
+
+    @callback
+    def _async_prepare_stop(self) -> tuple[str, ...]:
+        """Expect the fan to stop and return the members to turn off."""
+        self.async_cancel_ramp()
+        self.watchdog.async_commanded(0)
+        self.trace.record(TRACE_COMMAND, SERVICE_TURN_OFF, self.entity_ids, None)
+        return self.entity_ids
+
+    async def async_set_preset_mode(self, preset_mode: str) -> None:
+        """Let the source sensor drive the speed in auto mode.
+
+        Only state changes of the sensor are listened to, and the members are
+        only commanded when the sensor moves into a band with another speed.
+        Any other speed command leaves auto mode.
+        """
+        self.trace.record(TRACE_REQUEST, None, SERVICE_SET_PRESET_MODE, preset_mode)
+        if self._auto_sensor is None or self._unsub_auto is not None:
+            return
+        self.async_cancel_ramp()
+        self._attr_preset_mode = PRESET_AUTO
+        self._auto_band = None
+        self._unsub_auto = async_track_state_change_event(
+            self.hass, self._auto_sensor, self._async_auto_sensor_changed
+        )
+        self.async_write_ha_state()
+        state = self.hass.states.get(self._auto_sensor)
+        if (speed := self._auto_speed(state)) is not None:
+            await self._async_apply_auto(speed)
+
+    @callback
+    def async_cancel_auto(self) -> None:
+        """Leave auto mode."""
+        if self._unsub_auto is None:
+            return
+        self._unsub_auto()
+        self._unsub_auto = None
+        self._attr_preset_mode = None
+        self._auto_band = None
+        self.async_write_ha_state()
+
+    @callback
+    def _async_auto_sensor_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Follow the source sensor in auto mode."""
+        if (speed := self._auto_speed(event.data["new_state"])) is not None:
+            self.hass.async_create_task(
+                self._async_apply_auto(speed), "switch_fan auto", eager_start=True
+            )
+
+    def _auto_speed(self, state: State | None) -> int | None:
+        """Return the speed of the band the sensor moved into.
+
+        Returns None if the sensor stayed in its band, or the band has the
+        speed the fan already runs at.
+        """
+        assert self._auto_bands is not None
+        if state is None:
+            return None
+        try:
+            value = float(state.state)
+        except ValueError:
+            return None
+        band = self._auto_bands.band(value, self._auto_band)
+        if band == self._auto_band:
+            return None
+        self._auto_band = band
+        if (speed := self._auto_bands.speeds[band]) == self.speed_index:
+            return None
+        return speed
+
+    async def _async_apply_auto(self, speed: int) -> None:
+        """Change to the speed of the sensor's band."""
+        if speed == 0:
+            await self._async_stop()
+        else:
+            await self._async_set_speed(speed)
 
     async def async_turn_on(
         self,
@@ -197,13 +764,186 @@ class SwitchFan(FanEntity):
     ) -> None:
         """Turn on the fan.
 
-        If a percentage is given then the fan speed is set to that. Otherwise
-        the first entity is turned on.
+        If a percentage is given then the fan speed is set to that, and a
+        preset mode hands the speed to that mode. Otherwise the fan is turned
+        on at its first speed.
         """
-        if percentage is not None:
+        if preset_mode is not None:
+            await self.async_set_preset_mode(preset_mode)
+        elif percentage is not None:
             await self.async_set_percentage(percentage)
         elif self.is_on:
             # If we're on then do nothing
             return
         else:
-            await self.async_increase_speed()
+            await self.async_set_percentage(self._speed_curve.percentage(1))
+
+    async def async_increase_speed(self, percentage_step: int | None = None) -> None:
+        """Increase the speed of the fan.
+
+        Without a step the fan moves to the next speed, as the percentages
+        of a speed curve are not evenly spaced.
+        """
+        if percentage_step is not None:
+            await self.async_set_percentage(
+                min((self.percentage or 0) + percentage_step, 100)
+            )
+            return
+        speed = min((self.speed_index or 0) + 1, self.speed_count)
+        await self.async_set_percentage(self._speed_curve.percentage(speed))
+
+    async def async_decrease_speed(self, percentage_step: int | None = None) -> None:
+        """Decrease the speed of the fan, turning it off below the first speed.
+
+        Without a step the fan moves to the previous speed.
+        """
+        if percentage_step is not None:
+            await self.async_set_percentage(
+                max((self.percentage or 0) - percentage_step, 0)
+            )
+            return
+        speed = max((self.speed_index or 0) - 1, 0)
+        await self.async_set_percentage(self._speed_curve.percentage(speed))
+
+
+class DimmerFan(SwitchFan):
+    """Switch Fan entity driven by the brightness of a single light."""
+
+    SPEED_COUNT = 100
+
+    def __init__(
+        self,
+        unique_id: str,
+        name: str,
+        entity_ids: list[str],
+        device_info: DeviceInfo | None,
+        ramp_interval: float = 0,
+        runtime: RuntimeAccumulator | None = None,
+        batch_commands: bool = False,
+        auto_sensor: str | None = None,
+        auto_bands: AutoBands | None = None,
+        min_brightness: float = DEFAULT_MIN_BRIGHTNESS,
+        max_brightness: float = DEFAULT_MAX_BRIGHTNESS,
+        curve: float = DEFAULT_BRIGHTNESS_CURVE,
+    ) -> None:
+        """Initialize the fan entity."""
+        super().__init__(
+            unique_id,
+            name,
+            entity_ids,
+            device_info,
+            runtime=runtime,
+            batch_commands=batch_commands,
+            auto_sensor=auto_sensor,
+            auto_bands=auto_bands,
+        )
+        self._attr_speed_count = self.SPEED_COUNT
+        self._speed_curve = SpeedCurve.linear(self.SPEED_COUNT)
+        self._attr_supported_features |= FanEntityFeature.SET_SPEED
+        # The speed is continuous, so a ramp is the light's own transition
+        self._transition = ramp_interval
+        self._min_brightness = min_brightness * 255 / 100
+        self._brightness_span = (max_brightness - min_brightness) * 255 / 100
+        self._curve = curve
+        self._brightness: int | None = None
+        self._speed: int | None = None
+
+    @property
+    def speed_index(self) -> int | None:
+        """Return the speed percentage read from the light's brightness."""
+        return self._speed
+
+    @property
+    def runtime_speed(self) -> int | None:
+        """Return the speed runtime is accumulated for, 1 for any speed."""
+        return self._speed and 1
+
+    def refresh_entity_states(self):
+        """Refresh entity states."""
+        self._update_light(self.hass.states.get(self.entity_ids[0]))
+        super().refresh_entity_states()
+
+    @callback
+    def async_update_event_state_callback(self, event: Event[EventStateChangedData]):
+        """Watched light's state has changed."""
+        self._update_light(event.data["new_state"])
+        super().async_update_event_state_callback(event)
+
+    def _update_light(self, state: State | None) -> None:
+        """Cache the brightness of the light and the speed it converts to."""
+        if state is None or state.state not in (STATE_ON, STATE_OFF):
+            self._brightness = None
+        elif state.state == STATE_OFF:
+            self._brightness = 0
+        else:
+            self._brightness = state.attributes.get(ATTR_BRIGHTNESS) or 255
+        self._speed = self._brightness_to_speed(self._brightness)
+
+    def _brightness_to_speed(self, brightness: int | None) -> int | None:
+        """Convert the brightness of the light to a speed percentage."""
+        if not brightness:
+            return brightness
+        level = max(brightness - self._min_brightness, 0) / self._brightness_span
+        return max(1, min(100, round(min(level, 1) ** (1 / self._curve) * 100)))
+
+    def _speed_to_brightness(self, speed: int) -> int:
+        """Convert a speed percentage to the brightness of the light."""
+        level = (speed / 100) ** self._curve
+        return max(1, round(self._min_brightness + self._brightness_span * level))
+
+    async def async_set_speed_index(self, speed_index: int) -> None:
+        """Turn on the light with the brightness for the given speed."""
+        self.watchdog.async_commanded(speed_index)
+        await self.async_correct_speed_index(speed_index)
+
+    def is_speed_settled(self, speed_index: int) -> bool:
+        """Return if the light's brightness matches the given speed."""
+        if (brightness := self._brightness) is None:
+            return False
+        if not brightness or not speed_index:
+            return brightness == speed_index
+        # Compared as brightness, as a curve spreads speeds over uneven steps
+        return abs(brightness - self._speed_to_brightness(speed_index)) <= 1
+
+    async def async_turn_on(
+        self,
+        percentage: int | None = None,
+        preset_mode: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Turn on the fan.
+
+        Without a percentage or preset mode the light is turned on plainly,
+        so it comes back at its own last brightness.
+        """
+        if percentage is not None or preset_mode is not None or self.is_on:
+            await super().async_turn_on(percentage, preset_mode, **kwargs)
+            return
+        self.trace.record(TRACE_REQUEST, None, SERVICE_TURN_ON)
+        self.async_cancel_auto()
+        self.async_cancel_ramp()
+        # The speed the light comes back at is not known until it reports it
+        self.watchdog.async_cancel()
+        await self.call_service(SERVICE_TURN_ON, self.entity_ids)
+
+    async def async_set_motion(
+        self,
+        percentage: int | None = None,
+        direction: str | None = None,
+        oscillating: bool | None = None,
+    ) -> None:
+        """Set the speed, as a dimmer fan has no direction or oscillation."""
+        if percentage is not None:
+            await self.async_set_percentage(percentage)
+
+    async def async_correct_speed_index(self, speed_index: int) -> None:
+        """Send the light the brightness for the given speed."""
+        if speed_index == 0:
+            await self.call_service(SERVICE_TURN_OFF, self.entity_ids)
+            return
+        service_data: dict[str, Any] = {
+            ATTR_BRIGHTNESS: self._speed_to_brightness(speed_index)
+        }
+        if self._transition:
+            service_data[ATTR_TRANSITION] = self._transition
+        await self.call_service(SERVICE_TURN_ON, self.entity_ids, service_data)
@@ -0,0 +1,218 @@
+"""Helpers for tracking and controlling the member entities of switch fans."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import sys
+from typing import Any
+from weakref import WeakValueDictionary
+
+from homeassistant.const import CONF_ENTITY_ID, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, StateMachine, callback
+
+MEMBER_OFF = 0
+MEMBER_ON = 1
+MEMBER_UNAVAILABLE = 2
+
+_STATE_CODES = {STATE_OFF: MEMBER_OFF, STATE_ON: MEMBER_ON}
+_CODE_STATES = (STATE_OFF, STATE_ON, None)
+
+
+def _state_code(state: str | None) -> int:
+    """Return the code for the state of a member."""
+    if state is None:
+        return MEMBER_UNAVAILABLE
+    return _STATE_CODES.get(state, MEMBER_UNAVAILABLE)
+
+
+class Member:
+    """Member entity, shared by every switch fan that controls it."""
+
+    __slots__ = ("__weakref__", "entity_id")
+
+    def __init__(self, entity_id: str) -> None:
+        """Initialize the member."""
+        self.entity_id = sys.intern(entity_id)
+
+
+_MEMBERS: WeakValueDictionary[str, Member] = WeakValueDictionary()
+
+
+def get_member(entity_id: str) -> Member:
+    """Return the shared record for a member entity."""
+    if (member := _MEMBERS.get(entity_id)) is None:
+        member = _MEMBERS[entity_id] = Member(entity_id)
+    return member
+
+
+class MemberStates:
+    """Compact states of the members of a switch fan, slowest to fastest.
+
+    Each state is one byte of a fixed size array, updated in place, and the
+    member records are shared between fans.
+    """
+
+    __slots__ = ("entity_ids", "members", "states")
+
+    def __init__(self, entity_ids: Iterable[str]) -> None:
+        """Initialize the members, whose states are unknown until refreshed."""
+        self.members = tuple(get_member(entity_id) for entity_id in entity_ids)
+        self.entity_ids = tuple(member.entity_id for member in self.members)
+        self.states = bytearray()
+
+    def __len__(self) -> int:
+        """Return the number of members."""
+        return len(self.members)
+
+    def refresh(self, states: StateMachine) -> None:
+        """Read the state of every member from the state machine."""
+        codes = bytes(
+            _state_code(getattr(states.get(member.entity_id), "state", None))
+            for member in self.members
+        )
+        if self.states:
+            self.states[:] = codes
+        else:
+            self.states.extend(codes)
+
+    def set(self, entity_id: str, state: str | None) -> None:
+        """Update the state of a member."""
+        for position, member in enumerate(self.members):
+            if member.entity_id == entity_id:
+                self.states[position] = _state_code(state)
+
+    def active_speed(self) -> int | None:
+        """Return the speed of the first member that is on, or 0 if none are.
+
+        Returns None until the states have been refreshed.
+        """
+        if not self.states:
+            return None
+        return self.states.find(MEMBER_ON) + 1
+
+    def is_only_on(self, speed: int) -> bool:
+        """Return if only the member for the speed is on, or none for speed 0."""
+        states = self.states
+        if speed == 0:
+            return MEMBER_ON not in states
+        return states.count(MEMBER_ON) == 1 and states[speed - 1] == MEMBER_ON
+
+    def is_on(self, speed: int) -> bool:
+        """Return if the member for the speed is on."""
+        return bool(self.states) and self.states[speed - 1] == MEMBER_ON
+
+    def as_dict(self) -> dict[str, str | None]:
+        """Return the state of each member."""
+        return {
+            member.entity_id: _CODE_STATES[code]
+            for member, code in zip(self.members, self.states, strict=False)
+        }
+
+
+def group_by_domain(entity_ids: Iterable[str]) -> dict[str, set[str]]:
+    """Group entity IDs by their domain."""
+    groups: dict[str, set[str]] = {}
+    for entity_id in entity_ids:
+        domain, *_ = entity_id.split(".", 1)
+        if domain in groups:
+            groups[domain].add(entity_id)
+        else:
+            groups[domain] = {
+                entity_id,
+            }
+    return groups
+
+
+async def async_call_member_service(
+    hass: HomeAssistant,
+    service_name: str,
+    entity_ids: Iterable[str],
+    service_data: dict[str, Any] | None = None,
+) -> None:
+    """Call service for the given entity IDs.
+
+    Batches entities by their domain to minimize service calls.
+    """
+    for domain, sub_entity_ids in group_by_domain(entity_ids).items():
+        await hass.services.async_call(
+            domain=domain,
+            service=service_name,
+            service_data={
+                **(service_data or {}),
+                CONF_ENTITY_ID: sub_entity_ids,
+            },
+        )
+
+
+_CommandKey = tuple[str, str, tuple[tuple[str, Any], ...]]
+_CommandBatch = tuple[set[str], list[asyncio.Future[None]]]
+
+
+class MemberCommandBatcher:
+    """Merge the member service calls of all switch fans made in one loop tick.
+
+    Calls for the same domain, service and service data are collected until
+    the event loop runs its next iteration and then sent as a single call.
+    Every caller waits for the calls it contributed to and gets their error,
+    if any.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the batcher."""
+        self.hass = hass
+        self._pending: dict[_CommandKey, _CommandBatch] = {}
+        self._flush_scheduled = False
+
+    async def async_call(
+        self,
+        service_name: str,
+        entity_ids: Iterable[str],
+        service_data: dict[str, Any] | None = None,
+    ) -> None:
+        """Call service for the given entity IDs together with other callers."""
+        data = tuple(sorted((service_data or {}).items()))
+        futures: list[asyncio.Future[None]] = []
+        for domain, sub_entity_ids in group_by_domain(entity_ids).items():
+            key = (domain, service_name, data)
+            if (batch := self._pending.get(key)) is None:
+                batch = self._pending[key] = (set(), [])
+            batch[0].update(sub_entity_ids)
+            future = self.hass.loop.create_future()
+            batch[1].append(future)
+            futures.append(future)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.hass.loop.call_soon(self._async_flush)
+        # Waits for every domain, so no failure is left unretrieved
+        await asyncio.gather(*futures)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the calls collected during the last loop tick."""
+        pending = self._pending
+        self._pending = {}
+        self._flush_scheduled = False
+        self.hass.async_create_task(
+            self._async_send(pending), "switch_fan member commands", eager_start=True
+        )
+
+    async def _async_send(self, pending: dict[_CommandKey, _CommandBatch]) -> None:
+        """Send one service call for each batch and resolve its callers."""
+        for (domain, service_name, data), (entity_ids, futures) in pending.items():
+            error: Exception | None = None
+            try:
+                await self.hass.services.async_call(
+                    domain=domain,
+                    service=service_name,
+                    service_data={**dict(data), CONF_ENTITY_ID: entity_ids},
+                )
+            except Exception as err:  # noqa: BLE001
+                error = err
+            for future in futures:
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
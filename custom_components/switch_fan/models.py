@@ -0,0 +1,74 @@
+"""Models for the Switch Fan integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .accumulator import RuntimeStore
+    from .fan import SwitchFan
+    from .members import MemberCommandBatcher
+    from .scheduler import TimerScheduler
+
+
+@dataclass
+class SwitchFanData:
+    """Data shared by all Switch Fan config entries."""
+
+    timers: TimerScheduler
+    commands: MemberCommandBatcher
+    runtime: RuntimeStore
+    fans: dict[str, SwitchFan] = field(default_factory=dict)
+    profiling: bool = False
+
+
+TRACE_LENGTH = 200
+
+TRACE_REQUEST = "request"
+TRACE_COMMAND = "command"
+TRACE_EVENT = "event"
+
+_TRACE_FIELDS = {
+    TRACE_REQUEST: ("percentage", "service", "preset_mode", "direction", "oscillating"),
+    TRACE_COMMAND: ("service", "entity_ids", "service_data"),
+    TRACE_EVENT: ("entity_id", "state", "brightness"),
+}
+
+
+class FanTrace:
+    """Recent speed requests, member commands and member events of a fan.
+
+    Entries are tuples in a bounded ring buffer, so recording one is an
+    append and the oldest entries are dropped once it is full.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, length: int = TRACE_LENGTH) -> None:
+        """Initialize the trace."""
+        self._entries: deque[tuple[Any, ...]] = deque(maxlen=length)
+
+    def record(self, kind: str, *values: Any) -> None:
+        """Record an entry with the fields of its kind."""
+        self._entries.append((time.monotonic(), kind, *values))
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the entries, timed in seconds since the oldest one."""
+        if not self._entries:
+            return []
+        start = self._entries[0][0]
+        entries = []
+        for timestamp, kind, *values in self._entries:
+            entry: dict[str, Any] = {
+                "time": round(timestamp - start, 3),
+                "kind": kind,
+            }
+            # Trailing fields that are not used can be left out
+            for name, value in zip(_TRACE_FIELDS[kind], values, strict=False):
+                if value is not None:
+                    entry[name] = list(value) if isinstance(value, tuple) else value
+            entries.append(entry)
+        return entries
@@ -0,0 +1,193 @@
+"""On demand profiler for the switch fan hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import wraps
+import inspect
+import logging
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .fan import SwitchFan
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILED_METHODS = (
+    "async_update_event_state_callback",
+    "call_service",
+    "async_set_percentage",
+)
+PROFILED_PROPERTIES = ("percentage",)
+
+
+@dataclass(slots=True)
+class CallStats:
+    """Wall time spent in a profiled function."""
+
+    calls: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Record one call."""
+        self.calls += 1
+        self.total += elapsed
+        self.maximum = max(self.maximum, elapsed)
+
+
+class HotPathProfiler:
+    """Time the switch fan hot paths by wrapping them for a bounded window.
+
+    Nothing is instrumented outside the window: the wrappers are installed
+    on the entity classes when profiling starts and the original functions
+    are restored when it stops.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self.stats = {name: CallStats() for name in PROFILED_METHODS}
+        self.stats.update({name: CallStats() for name in PROFILED_PROPERTIES})
+        self._originals: list[tuple[type, str, Any]] = []
+        self._depth = dict.fromkeys(self.stats, 0)
+
+    @callback
+    def async_start(self) -> None:
+        """Install the timing wrappers."""
+        for cls in (SwitchFan, *SwitchFan.__subclasses__()):
+            for name, original in list(vars(cls).items()):
+                if name in PROFILED_METHODS:
+                    wrapped: Any = self._wrap(name, original)
+                elif name in PROFILED_PROPERTIES:
+                    wrapped = property(self._wrap(name, original.fget))
+                else:
+                    continue
+                self._originals.append((cls, name, original))
+                setattr(cls, name, wrapped)
+        self._async_resubscribe()
+
+    @callback
+    def async_stop(self) -> None:
+        """Restore the original functions."""
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals.clear()
+        self._async_resubscribe()
+
+    @callback
+    def _async_resubscribe(self) -> None:
+        """Subscribe the fans' state listeners to the current callbacks."""
+        for fan in self.hass.data[DOMAIN].fans.values():
+            fan.async_track_members()
+
+    def _wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return func wrapped to record its wall time under name."""
+        stats = self.stats[name]
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    stats.add(time.perf_counter() - start)
+
+            return async_wrapper
+
+        depth = self._depth
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Overrides calling super() are only timed once
+            if depth[name]:
+                return func(*args, **kwargs)
+            depth[name] += 1
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats.add(time.perf_counter() - start)
+                depth[name] -= 1
+
+        return wrapper
+
+    def report(self) -> str:
+        """Return a summary of the recorded calls."""
+        lines = [f"{'function':<36}{'calls':>10}{'total ms':>12}{'max ms':>10}"]
+        for name, stats in self.stats.items():
+            lines.append(
+                f"{name:<36}{stats.calls:>10}"
+                f"{stats.total * 1000:>12.3f}{stats.maximum * 1000:>10.3f}"
+            )
+        return "\n".join(lines)
+
+
+def _allocation_report(
+    start: tracemalloc.Snapshot, end: tracemalloc.Snapshot, limit: int = 25
+) -> str:
+    """Return the lines of the integration that allocated the most memory."""
+    domain_filter = [tracemalloc.Filter(True, f"*{DOMAIN}*")]
+    differences = end.filter_traces(domain_filter).compare_to(
+        start.filter_traces(domain_filter), "lineno"
+    )
+    return "\n".join(str(difference) for difference in differences[:limit])
+
+
+def _write_report(path: str, report: str) -> None:
+    """Write the report to a file."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(report)
+
+
+async def async_profile(
+    hass: HomeAssistant, seconds: float, trace_allocations: bool
+) -> str:
+    """Profile the switch fans for some seconds and write a report.
+
+    Returns the path of the report.
+    """
+    profiler = HotPathProfiler(hass)
+    started_tracemalloc = False
+    start_snapshot: tracemalloc.Snapshot | None = None
+    end_snapshot: tracemalloc.Snapshot | None = None
+    try:
+        if trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracemalloc = True
+            start_snapshot = await hass.async_add_executor_job(
+                tracemalloc.take_snapshot
+            )
+        profiler.async_start()
+        await asyncio.sleep(seconds)
+        if start_snapshot is not None:
+            end_snapshot = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+    finally:
+        # Also when cancelled, so nothing keeps tracing once profiling ends
+        profiler.async_stop()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+    report = [f"Switch Fan profile over {seconds} seconds", "", profiler.report()]
+    if start_snapshot is not None and end_snapshot is not None:
+        allocations = await hass.async_add_executor_job(
+            _allocation_report, start_snapshot, end_snapshot
+        )
+        report += ["", "Allocations", allocations]
+
+    path = hass.config.path(
+        f"{DOMAIN}_profile.{dt_util.utcnow().strftime('%Y%m%d%H%M%S')}.txt"
+    )
+    await hass.async_add_executor_job(_write_report, path, "\n".join(report) + "\n")
+    _LOGGER.info("Switch Fan profile written to %s", path)
+    return path
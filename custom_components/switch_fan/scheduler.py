@@ -0,0 +1,137 @@
+"""Auto-off timer scheduler shared by all switch fans."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from datetime import datetime, timedelta
+import heapq
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+STORAGE_KEY = f"{DOMAIN}.timers"
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+# Timers expiring this close together are fired in the same batch
+COALESCE_WINDOW = 1.0
+
+
+class TimerScheduler:
+    """Fire the auto-off timers of every switch fan from a single min-heap.
+
+    Only the earliest deadline is ever armed with the event loop. Changing
+    a timer pushes a new heap entry and leaves the old one to be discarded
+    when it reaches the top, so extending timers does not churn loop timers.
+    Deadlines are stored as absolute timestamps so they survive a restart.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        async_expire: Callable[[list[str]], Coroutine[Any, Any, None]],
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._async_expire = async_expire
+        self._store: Store[dict[str, float]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._deadlines: dict[str, float] = {}
+        self._restored: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._armed_at: float | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+        self._job = HassJob(
+            self._async_fire, "switch_fan timers", cancel_on_shutdown=True
+        )
+
+    async def async_load(self) -> None:
+        """Load the deadlines stored before the last restart."""
+        self._restored = await self._store.async_load() or {}
+
+    @callback
+    def async_restore(self, key: str) -> None:
+        """Reschedule a timer stored before the last restart.
+
+        Timers that expired while Home Assistant was stopped fire right away.
+        """
+        if (deadline := self._restored.pop(key, None)) is not None:
+            self._async_schedule(key, deadline)
+
+    @callback
+    def async_set(self, key: str, duration: timedelta) -> None:
+        """Set a timer to expire after the given duration."""
+        deadline = dt_util.utcnow().timestamp() + duration.total_seconds()
+        self._async_schedule(key, deadline)
+
+    @callback
+    def async_cancel(self, key: str) -> None:
+        """Cancel a timer."""
+        restored = self._restored.pop(key, None)
+        if self._deadlines.pop(key, None) is None and restored is None:
+            return
+        self._async_save()
+
+    def deadline(self, key: str) -> datetime | None:
+        """Return when the timer expires, or None if it is not set."""
+        if (deadline := self._deadlines.get(key)) is None:
+            return None
+        return dt_util.utc_from_timestamp(deadline)
+
+    @callback
+    def _async_schedule(self, key: str, deadline: float) -> None:
+        """Schedule a timer at an absolute deadline."""
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+        if self._armed_at is None or deadline < self._armed_at:
+            self._async_arm()
+        self._async_save()
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the loop timer for the earliest live deadline."""
+        heap = self._heap
+        # Discard entries of timers that were changed or cancelled
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if not heap:
+            self._armed_at = None
+            return
+        self._armed_at = heap[0][0]
+        self._unsub = async_track_point_in_utc_time(
+            self.hass, self._job, dt_util.utc_from_timestamp(self._armed_at)
+        )
+
+    async def _async_fire(self, now: datetime) -> None:
+        """Expire every timer that is due in one batch."""
+        self._unsub = None
+        self._armed_at = None
+        cutoff = now.timestamp() + COALESCE_WINDOW
+        heap = self._heap
+        expired: list[str] = []
+        while heap and heap[0][0] <= cutoff:
+            deadline, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                expired.append(key)
+        self._async_arm()
+        if expired:
+            self._async_save()
+            await self._async_expire(expired)
+
+    @callback
+    def _async_save(self) -> None:
+        """Save the deadlines of all timers."""
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, float]:
+        """Return the deadlines to store, including timers not yet restored."""
+        return self._restored | self._deadlines
@@ -0,0 +1,97 @@
+"""Sensor platform for Switch Fan integration."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_DEVICE_ID, EntityCategory, UnitOfEnergy, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device import async_device_info_to_link_from_device_id
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .accumulator import RuntimeAccumulator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Initialize Switch Fan runtime sensors."""
+    runtime: RuntimeAccumulator = config_entry.runtime_data
+    device_info = async_device_info_to_link_from_device_id(
+        hass,
+        config_entry.options.get(CONF_DEVICE_ID),
+    )
+
+    entities: list[SwitchFanSensor] = []
+    for speed in range(1, runtime.speed_count + 1):
+        entities.append(RuntimeSensor(config_entry, runtime, speed, device_info))
+        if runtime.watts is not None:
+            entities.append(EnergySensor(config_entry, runtime, speed, device_info))
+    async_add_entities(entities)
+
+
+class SwitchFanSensor(SensorEntity):
+    """Base class for the diagnostic sensors of a switch fan."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_should_poll = False
+
+    key: str
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        runtime: RuntimeAccumulator,
+        speed: int,
+        device_info: DeviceInfo | None,
+    ) -> None:
+        """Initialize the sensor."""
+        self._runtime = runtime
+        self._speed = speed
+        self._attr_unique_id = f"{config_entry.entry_id}_{self.key}_{speed}"
+        self._attr_name = f"{config_entry.title} speed {speed} {self.key}"
+        self._attr_device_info = device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Entity added to HASS."""
+        self.async_on_remove(
+            self._runtime.async_add_listener(self.async_write_ha_state)
+        )
+
+
+class RuntimeSensor(SwitchFanSensor):
+    """Hours a switch fan has run at one speed."""
+
+    key = "runtime"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.HOURS
+    _attr_suggested_display_precision = 2
+
+    @property
+    def native_value(self) -> float:
+        """Return the hours run at the speed."""
+        return self._runtime.hours(self._speed)
+
+
+class EnergySensor(SwitchFanSensor):
+    """Energy a switch fan has used at one speed."""
+
+    key = "energy"
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_suggested_display_precision = 3
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the energy used at the speed."""
+        return self._runtime.energy(self._speed)
@@ -0,0 +1,102 @@
+"""Speed lookup tables for switch fans."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import pairwise
+
+from homeassistant.util.percentage import ranged_value_to_percentage
+
+
+def parse_thresholds(value: str) -> list[float]:
+    """Parse a comma separated list of ascending thresholds.
+
+    Raises ValueError if any of the values is not a number or they do not
+    ascend.
+    """
+    thresholds = [float(threshold) for threshold in value.split(",")]
+    if any(low >= high for low, high in pairwise(thresholds)):
+        raise ValueError("Thresholds must ascend")
+    return thresholds
+
+
+def parse_speed_curve(value: str) -> list[int]:
+    """Parse a comma separated list of ascending percentages, one per speed.
+
+    Raises ValueError if any of the values is not a whole percentage from 1
+    to 100 or they do not ascend.
+    """
+    percentages = [int(percentage) for percentage in value.split(",")]
+    if not all(0 < percentage <= 100 for percentage in percentages) or any(
+        low >= high for low, high in pairwise(percentages)
+    ):
+        raise ValueError("Percentages must ascend from 1 to 100")
+    return percentages
+
+
+class SpeedCurve:
+    """Convert between fan percentages and speeds with a breakpoint table.
+
+    Each speed has the percentage of airflow it delivers, and a percentage
+    selects the slowest speed that delivers at least that much. Both lookups
+    are done on tables built once, with no float arithmetic.
+    """
+
+    __slots__ = ("breakpoints", "percentages")
+
+    def __init__(self, percentages: list[int]) -> None:
+        """Initialize the curve from the percentage of each speed."""
+        self.breakpoints = tuple(percentages)
+        self.percentages = (0, *percentages)
+
+    @classmethod
+    def linear(cls, speed_count: int) -> SpeedCurve:
+        """Return the curve of evenly spaced speeds."""
+        return cls(
+            [
+                ranged_value_to_percentage((1, speed_count), speed)
+                for speed in range(1, speed_count + 1)
+            ]
+        )
+
+    def speed(self, percentage: int) -> int:
+        """Return the speed for a percentage, 0 for 0."""
+        if percentage <= 0:
+            return 0
+        return (
+            min(bisect_left(self.breakpoints, percentage), len(self.breakpoints) - 1)
+            + 1
+        )
+
+    def percentage(self, speed: int) -> int:
+        """Return the percentage of a speed, 0 for 0."""
+        return self.percentages[speed]
+
+
+class AutoBands:
+    """Map the value of a source sensor to a fan speed.
+
+    The thresholds split the values into bands, band 0 below the first
+    threshold and band n from the last one. The speed of each band is
+    computed once, so a lookup is a bisect of the thresholds. A band is only
+    left downwards once the value is more than the hysteresis below its
+    threshold, so a value hovering around a threshold does not flap the fan.
+    """
+
+    __slots__ = ("hysteresis", "speeds", "thresholds")
+
+    def __init__(
+        self, thresholds: list[float], speed_count: int, hysteresis: float = 0
+    ) -> None:
+        """Initialize the bands, spreading them evenly over the speeds."""
+        self.thresholds = tuple(thresholds)
+        self.hysteresis = hysteresis
+        count = len(thresholds)
+        self.speeds = tuple(speed_count * band // count for band in range(count + 1))
+
+    def band(self, value: float, current: int | None) -> int:
+        """Return the band for the value, given the current band."""
+        band = bisect_right(self.thresholds, value)
+        if current is None or band >= current:
+            return band
+        return min(bisect_right(self.thresholds, value + self.hysteresis), current)
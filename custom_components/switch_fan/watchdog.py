@@ -0,0 +1,113 @@
+"""Watchdog that confirms commanded fan speeds take effect."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+CONFIRM_TIMEOUT = 5.0
+MAX_ATTEMPTS = 3
+
+
+class DriftWatchdog:
+    """Reissue commands whose speed was not reached by their deadline.
+
+    Nothing runs while the fan is idle. Each command arms a single
+    confirmation deadline, which is cancelled as soon as the member states
+    report the commanded speed. If the deadline passes first the fan is asked
+    to correct the drift and the deadline is re-armed with a doubled timeout,
+    until the speed is reached or the attempts run out.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        is_settled: Callable[[int], bool],
+        async_correct: Callable[[int], Coroutine[Any, Any, None]],
+    ) -> None:
+        """Initialize the watchdog."""
+        self.hass = hass
+        self.name = name
+        self._is_settled = is_settled
+        self._async_correct = async_correct
+        self._target: int | None = None
+        self._attempt = 0
+        self._unsub: CALLBACK_TYPE | None = None
+        self._job = HassJob(
+            self._async_deadline, "switch_fan watchdog", cancel_on_shutdown=True
+        )
+        self.drift_count = 0
+        self.correction_count = 0
+        self.failure_count = 0
+
+    @callback
+    def async_commanded(self, target: int) -> None:
+        """Watch for the given speed to be reached."""
+        self.async_cancel()
+        self._target = target
+        self._attempt = 0
+        self._async_arm()
+
+    @callback
+    def async_check(self) -> None:
+        """Stop watching once the commanded speed has been reached."""
+        if self._target is not None and self._is_settled(self._target):
+            self.async_cancel()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop watching the commanded speed."""
+        self._target = None
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the confirmation deadline for the current attempt."""
+        self._unsub = async_call_later(
+            self.hass, CONFIRM_TIMEOUT * 2**self._attempt, self._job
+        )
+
+    async def _async_deadline(self, _now: datetime) -> None:
+        """Correct the members if the commanded speed was not reached."""
+        self._unsub = None
+        if (target := self._target) is None:
+            return
+        if self._is_settled(target):
+            self._target = None
+            return
+        if self._attempt == 0:
+            self.drift_count += 1
+        if self._attempt >= MAX_ATTEMPTS:
+            _LOGGER.warning(
+                "%s did not reach speed %s after %s corrections",
+                self.name,
+                target,
+                self._attempt,
+            )
+            self.failure_count += 1
+            self._target = None
+            return
+        self._attempt += 1
+        self.correction_count += 1
+        self._async_arm()
+        await self._async_correct(target)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the watchdog state for diagnostics."""
+        return {
+            "target": self._target,
+            "attempt": self._attempt,
+            "drift_count": self.drift_count,
+            "correction_count": self.correction_count,
+            "failure_count": self.failure_count,
+        }
@@ -5,6 +5,13 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from tests.common import setup_test_component_platform
+from tests.components.switch.common import MockSwitch
+
 
 @pytest.fixture
 def mock_setup_entry() -> Generator[AsyncMock]:
@@ -13,3 +20,18 @@ def mock_setup_entry() -> Generator[AsyncMock]:
         "homeassistant.components.switch_fan.async_setup_entry", return_value=True
     ) as mock_setup_entry:
         yield mock_setup_entry
+
+
+@pytest.fixture
+async def mock_switch_entity_ids(
+    hass: HomeAssistant, mock_switch_entities: list[MockSwitch]
+) -> list[str]:
+    """Mock switch entities and return their entity IDs."""
+    setup_test_component_platform(hass, SWITCH_DOMAIN, mock_switch_entities)
+
+    assert await async_setup_component(
+        hass, SWITCH_DOMAIN, {"switch": {"platform": "test"}}
+    )
+    await hass.async_block_till_done()
+
+    return [mse.entity_id for mse in mock_switch_entities]
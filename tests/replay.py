@@ -0,0 +1,125 @@
+"""Replay of switch fan traces for the Switch Fan tests.
+
+A trace downloaded with the diagnostics of a fan is replayed against a new
+fan whose members are plain states: requests become service calls,
+member events become state changes and the commands the fan sends in
+response are recorded instead of switching anything. Time is advanced with
+the ``freezer`` fixture, so a replay is deterministic.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.fan import (
+    ATTR_DIRECTION,
+    ATTR_OSCILLATING,
+    ATTR_PERCENTAGE,
+    ATTR_PRESET_MODE,
+    DOMAIN as FAN_DOMAIN,
+    SERVICE_SET_PERCENTAGE,
+)
+from homeassistant.components.switch_fan.const import DOMAIN, SERVICE_SET_MOTION
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    EVENT_STATE_CHANGED,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from tests.common import MockConfigEntry, async_fire_time_changed, async_mock_service
+
+REPLAY_FAN = "fan.replay"
+
+# The arguments of a request, as named by the services they are replayed with
+REQUEST_FIELDS = (ATTR_PERCENTAGE, ATTR_PRESET_MODE, ATTR_DIRECTION, ATTR_OSCILLATING)
+
+
+@dataclass
+class ReplayReport:
+    """Results of a replay."""
+
+    commands: list[dict[str, Any]] = field(default_factory=list)
+    state_writes: int = 0
+    percentage: int | None = None
+
+
+def trace_commands(trace: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return the commands a fan sent in a trace, without their timing."""
+    return [
+        {key: value for key, value in entry.items() if key != "time"}
+        for entry in trace
+        if entry["kind"] == "command"
+    ]
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    trace: list[dict[str, Any]],
+    entity_ids: list[str],
+    options: dict[str, Any] | None = None,
+) -> ReplayReport:
+    """Replay the requests and member events of a trace against a new fan."""
+    report = ReplayReport()
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, STATE_OFF)
+    for domain in {entity_id.split(".", 1)[0] for entity_id in entity_ids}:
+        async_mock_service(hass, domain, SERVICE_TURN_ON)
+        async_mock_service(hass, domain, SERVICE_TURN_OFF)
+
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        options={"entities": entity_ids, "name": "Replay", **(options or {})},
+        title="Replay",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        if event.data["entity_id"] == REPLAY_FAN:
+            report.state_writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+    elapsed = 0.0
+    for entry in trace:
+        if (delay := entry["time"] - elapsed) > 0:
+            freezer.tick(timedelta(seconds=delay))
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+            elapsed = entry["time"]
+        if entry["kind"] == "request":
+            # Requests without a service set the percentage
+            service = entry.get("service", SERVICE_SET_PERCENTAGE)
+            await hass.services.async_call(
+                DOMAIN if service == SERVICE_SET_MOTION else FAN_DOMAIN,
+                service,
+                {
+                    ATTR_ENTITY_ID: REPLAY_FAN,
+                    **{name: entry[name] for name in REQUEST_FIELDS if name in entry},
+                },
+                blocking=True,
+            )
+        elif entry["kind"] == "event":
+            if "state" not in entry:
+                hass.states.async_remove(entry["entity_id"])
+            else:
+                attributes = (
+                    {"brightness": entry["brightness"]} if "brightness" in entry else {}
+                )
+                hass.states.async_set(entry["entity_id"], entry["state"], attributes)
+        await hass.async_block_till_done()
+    unsub()
+
+    fan = hass.data[DOMAIN].fans[config_entry.entry_id]
+    report.commands = trace_commands(fan.trace.as_list())
+    report.percentage = hass.states.get(REPLAY_FAN).attributes.get(ATTR_PERCENTAGE)
+    return report
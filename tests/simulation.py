@@ -0,0 +1,272 @@
+"""Simulated relays and a load harness for the Switch Fan tests.
+
+Relays act on loop timers, so a harness driven with the ``freezer`` fixture
+runs in simulated time: latencies are exact and runs are reproducible.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import random
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.fan import (
+    ATTR_PERCENTAGE,
+    DOMAIN as FAN_DOMAIN,
+    SERVICE_SET_PERCENTAGE,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN, SwitchEntity
+from homeassistant.components.switch_fan.const import DOMAIN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    EVENT_CALL_SERVICE,
+    EVENT_STATE_CHANGED,
+    STATE_ON,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from tests.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    setup_test_component_platform,
+)
+
+
+@dataclass(frozen=True)
+class RelayProfile:
+    """How a simulated relay responds to commands."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    report_delay: float = 0.0
+
+
+class SimulatedRelay(SwitchEntity):
+    """Switch that actuates and reports its state after a delay."""
+
+    _attr_should_poll = False
+
+    def __init__(self, name: str, profile: RelayProfile, rng: random.Random) -> None:
+        """Initialize the relay."""
+        self._attr_name = name
+        self._attr_unique_id = name
+        self._attr_is_on = False
+        self.profile = profile
+        self.commands = 0
+        self.dropped = 0
+        self._rng = rng
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the relay on."""
+        self._async_command(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the relay off."""
+        self._async_command(False)
+
+    @callback
+    def _async_command(self, is_on: bool) -> None:
+        """Actuate the relay after its latency, unless the command is dropped."""
+        self.commands += 1
+        if self._rng.random() < self.profile.drop_rate:
+            self.dropped += 1
+            return
+        delay = self.profile.latency + self._rng.uniform(0, self.profile.jitter)
+
+        @callback
+        def _async_actuate(_now: datetime) -> None:
+            self._attr_is_on = is_on
+            if self.profile.report_delay:
+                async_call_later(
+                    self.hass, self.profile.report_delay, self._async_report
+                )
+            else:
+                self.async_write_ha_state()
+
+        async_call_later(self.hass, delay, _async_actuate)
+
+    @callback
+    def _async_report(self, _now: datetime) -> None:
+        """Report the state of the relay."""
+        self.async_write_ha_state()
+
+
+@dataclass
+class LoadReport:
+    """Results of a load run."""
+
+    latencies: list[float] = field(default_factory=list)
+    service_calls: int = 0
+    state_writes: int = 0
+    unsettled: int = 0
+
+    def percentile(self, percent: float) -> float:
+        """Return the command to settle latency at the given percentile."""
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, round(percent / 100 * (len(latencies) - 1)))
+        return latencies[index]
+
+    @property
+    def p50(self) -> float:
+        """Return the median command to settle latency."""
+        return self.percentile(50)
+
+    @property
+    def p99(self) -> float:
+        """Return the 99th percentile command to settle latency."""
+        return self.percentile(99)
+
+
+class LoadHarness:
+    """Drive many switch fans backed by simulated relays."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        freezer: FrozenDateTimeFactory,
+        fan_count: int,
+        speed_count: int,
+        profile: RelayProfile,
+        seed: int = 0,
+        batch_commands: bool = False,
+    ) -> None:
+        """Initialize the harness."""
+        self.hass = hass
+        self.batch_commands = batch_commands
+        self.freezer = freezer
+        self.rng = random.Random(seed)
+        self.relays = [
+            [
+                SimulatedRelay(f"relay {fan} {speed}", profile, self.rng)
+                for speed in range(speed_count)
+            ]
+            for fan in range(fan_count)
+        ]
+        self.fan_entity_ids = [f"fan.fan_{fan}" for fan in range(fan_count)]
+
+    async def async_setup(self) -> None:
+        """Set up the relays and a switch fan for each set of relays."""
+        setup_test_component_platform(
+            self.hass,
+            SWITCH_DOMAIN,
+            [relay for relays in self.relays for relay in relays],
+        )
+        assert await async_setup_component(
+            self.hass, SWITCH_DOMAIN, {SWITCH_DOMAIN: {"platform": "test"}}
+        )
+        await self.hass.async_block_till_done()
+
+        for fan, relays in enumerate(self.relays):
+            config_entry = MockConfigEntry(
+                data={},
+                domain=DOMAIN,
+                options={
+                    "entities": [relay.entity_id for relay in relays],
+                    "name": f"Fan {fan}",
+                    **({"batch_commands": True} if self.batch_commands else {}),
+                },
+                title=f"Fan {fan}",
+            )
+            config_entry.add_to_hass(self.hass)
+            await self.hass.config_entries.async_setup(config_entry.entry_id)
+        await self.hass.async_block_till_done()
+
+    def random_storm(self, waves: int, commands: int) -> list[list[tuple[int, int]]]:
+        """Return waves of commands setting distinct random fans to random speeds."""
+        return [
+            [
+                (fan, self.rng.choice((0, 33, 66, 100)))
+                for fan in self.rng.sample(range(len(self.relays)), commands)
+            ]
+            for _ in range(waves)
+        ]
+
+    def _is_settled(self, fan: int, percentage: int) -> bool:
+        """Return if only the relay for the percentage of a fan is on."""
+        relays = self.relays[fan]
+        speed = -(-percentage * len(relays) // 100)
+        return all(
+            (self.hass.states.get(relay.entity_id).state == STATE_ON)
+            == (index == speed)
+            for index, relay in enumerate(relays, 1)
+        )
+
+    async def async_run(
+        self,
+        waves: list[list[tuple[int, int]]],
+        wave_interval: timedelta = timedelta(seconds=1),
+        step: timedelta = timedelta(milliseconds=10),
+        timeout: timedelta = timedelta(seconds=60),
+    ) -> LoadReport:
+        """Send waves of (fan, percentage) commands and wait for them to settle."""
+        hass = self.hass
+        report = LoadReport()
+        pending: dict[int, tuple[int, datetime]] = {}
+        fans = {entity_id: fan for fan, entity_id in enumerate(self.fan_entity_ids)}
+
+        @callback
+        def _async_service_called(event: Event) -> None:
+            if event.data["domain"] != FAN_DOMAIN:
+                report.service_calls += 1
+
+        @callback
+        def _async_state_changed(event: Event) -> None:
+            if (fan := fans.get(event.data["entity_id"])) is None:
+                return
+            report.state_writes += 1
+            if (command := pending.get(fan)) and self._is_settled(fan, command[0]):
+                report.latencies.append((dt_util.utcnow() - command[1]).total_seconds())
+                del pending[fan]
+
+        unsubs = [
+            hass.bus.async_listen(EVENT_CALL_SERVICE, _async_service_called),
+            hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed),
+        ]
+        start = dt_util.utcnow()
+        next_wave = start
+        waves = list(waves)
+        while waves or pending:
+            now = dt_util.utcnow()
+            if now - start > timeout:
+                break
+            if waves and now >= next_wave:
+                wave = waves.pop(0)
+                for fan, percentage in wave:
+                    pending[fan] = (percentage, now)
+                # Sent together, like an automation acting on many fans
+                await asyncio.gather(
+                    *(
+                        hass.services.async_call(
+                            FAN_DOMAIN,
+                            SERVICE_SET_PERCENTAGE,
+                            {
+                                ATTR_ENTITY_ID: self.fan_entity_ids[fan],
+                                ATTR_PERCENTAGE: percentage,
+                            },
+                            blocking=True,
+                        )
+                        for fan, percentage in wave
+                    )
+                )
+                next_wave = now + wave_interval
+                await hass.async_block_till_done()
+                # Commands for a speed the fan is already at never change state
+                for fan, (percentage, _) in list(pending.items()):
+                    if self._is_settled(fan, percentage):
+                        report.latencies.append(0.0)
+                        del pending[fan]
+            self.freezer.tick(step)
+            async_fire_time_changed(hass)
+            await hass.async_block_till_done()
+
+        for unsub in unsubs:
+            unsub()
+        report.unsettled = len(pending)
+        return report
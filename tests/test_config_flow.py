@@ -127,3 +127,103 @@ async def test_options(
 
     state = hass.states.get(f"{platform}.my_switch_fan")
     assert state.state == "off"
+
+
+async def test_config_flow_dimmer_requires_single_light(hass: HomeAssistant) -> None:
+    """Test the dimmer speed control only accepts a single light."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            "name": "My switch fan",
+            "entities": ["switch.low", "switch.high"],
+            "dimmer": True,
+        },
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "dimmer_requires_single_light"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            "name": "My switch fan",
+            "entities": ["light.dimmer"],
+            "dimmer": True,
+            "min_brightness": 20,
+        },
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["options"] == {
+        "entities": ["light.dimmer"],
+        "hide_members": False,
+        "name": "My switch fan",
+        "dimmer": True,
+        "min_brightness": 20,
+    }
+
+
+async def test_config_flow_auto_thresholds(hass: HomeAssistant) -> None:
+    """Test the auto mode thresholds are validated."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    user_input = {
+        "name": "My switch fan",
+        "entities": ["switch.low", "switch.high"],
+        "auto_sensor": "sensor.temperature",
+    }
+    for thresholds, error in (
+        (None, "auto_requires_sensor_and_thresholds"),
+        ("24,hot", "invalid_auto_thresholds"),
+        ("27,24", "invalid_auto_thresholds"),
+        ("24,27,30", "invalid_auto_thresholds"),
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            user_input
+            if thresholds is None
+            else {**user_input, "auto_thresholds": thresholds},
+        )
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {"base": error}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**user_input, "auto_thresholds": "24,27"}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["options"] == {
+        "entities": ["switch.low", "switch.high"],
+        "hide_members": False,
+        "name": "My switch fan",
+        "auto_sensor": "sensor.temperature",
+        "auto_thresholds": "24,27",
+    }
+
+
+async def test_config_flow_speed_curve(hass: HomeAssistant) -> None:
+    """Test the speed curve needs one percentage for each switch."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+
+    user_input = {"name": "My switch fan", "entities": ["switch.low", "switch.high"]}
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**user_input, "speed_curve": "20,45,100"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_speed_curve"}
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {**user_input, "speed_curve": "40,100"}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["options"] == {
+        "entities": ["switch.low", "switch.high"],
+        "hide_members": False,
+        "name": "My switch fan",
+        "speed_curve": "40,100",
+    }
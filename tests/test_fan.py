@@ -1,11 +1,26 @@
 """The tests for the switch fan platform."""
 
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.components.fan import (
+    ATTR_DIRECTION,
+    ATTR_OSCILLATING,
     ATTR_PERCENTAGE,
+    ATTR_PRESET_MODE,
+    ATTR_PRESET_MODES,
+    DIRECTION_FORWARD,
+    DIRECTION_REVERSE,
     DOMAIN as FAN_DOMAIN,
+    SERVICE_DECREASE_SPEED as FAN_SERVICE_DECREASE_SPEED,
+    SERVICE_INCREASE_SPEED as FAN_SERVICE_INCREASE_SPEED,
+    SERVICE_SET_DIRECTION as FAN_SERVICE_SET_DIRECTION,
     SERVICE_SET_PERCENTAGE as FAN_SERVICE_SET_PERCENTAGE,
+    SERVICE_SET_PRESET_MODE as FAN_SERVICE_SET_PRESET_MODE,
     SERVICE_TURN_OFF as FAN_SERVICE_TURN_OFF,
     SERVICE_TURN_ON as FAN_SERVICE_TURN_ON,
 )
@@ -14,12 +29,29 @@ from homeassistant.components.switch import (
     SERVICE_TURN_OFF as SWITCH_SERVICE_TURN_OFF,
 )
 from homeassistant.components.switch_fan.const import DOMAIN
-from homeassistant.const import ATTR_ENTITY_ID, STATE_OFF, STATE_ON
+from homeassistant.components.switch_fan.fan import SwitchFan
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    EVENT_CALL_SERVICE,
+    STATE_OFF,
+    STATE_ON,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
 
-from tests.common import MockConfigEntry, setup_test_component_platform
+from tests.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+    async_mock_service,
+)
+from tests.components.diagnostics import get_diagnostics_for_config_entry
 from tests.components.switch.common import MockSwitch
+from tests.typing import ClientSessionGenerator
+
+from .replay import async_replay, trace_commands
 
 SWITCH_FAN = "fan.my_switch_fan"
 
@@ -32,23 +64,16 @@ async def setup_hass(hass: HomeAssistant) -> None:
 
 
 @pytest.fixture
-async def mock_switch_entity_ids(
-    hass: HomeAssistant, mock_switch_entities: list[MockSwitch]
-) -> list[str]:
-    """Mock switch entities and return their entity IDs."""
-    setup_test_component_platform(hass, SWITCH_DOMAIN, mock_switch_entities)
-
-    assert await async_setup_component(
-        hass, SWITCH_DOMAIN, {"switch": {"platform": "test"}}
-    )
-    await hass.async_block_till_done()
-
-    return [mse.entity_id for mse in mock_switch_entities]
+def config_entry_options() -> dict[str, Any]:
+    """Return the options a test adds to the config entry."""
+    return {}
 
 
 @pytest.fixture
 async def setup_config_entry(
-    hass: HomeAssistant, mock_switch_entity_ids: list[str]
+    hass: HomeAssistant,
+    mock_switch_entity_ids: list[str],
+    config_entry_options: dict[str, Any],
 ) -> MockConfigEntry:
     """Mock config entry."""
     config_entry = MockConfigEntry(
@@ -57,6 +82,7 @@ async def setup_config_entry(
         options={
             "entities": mock_switch_entity_ids,
             "name": "My switch fan",
+            **config_entry_options,
         },
         title="My switch fan",
     )
@@ -302,3 +328,845 @@ async def test_set_percentage(
     assert hass.states.get(mock_switch_entity_ids[0]).state == STATE_OFF
     assert hass.states.get(mock_switch_entity_ids[1]).state == STATE_OFF
     assert hass.states.get(mock_switch_entity_ids[2]).state == STATE_OFF
+
+
+@pytest.mark.parametrize("config_entry_options", [{"ramp_interval": 5}])
+@pytest.mark.parametrize(
+    "mock_switch_entities",
+    [
+        [
+            MockSwitch("switch.low", STATE_OFF),
+            MockSwitch("switch.medium", STATE_OFF),
+            MockSwitch("switch.high", STATE_OFF),
+        ]
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_set_percentage_with_ramp(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test the fan steps through each speed when a ramp interval is set."""
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 100},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes.get(ATTR_PERCENTAGE) == 33
+    assert state.attributes.get("ramp_target") == 100
+
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes.get(ATTR_PERCENTAGE) == 66
+    assert state.attributes.get("ramp_target") == 100
+
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes.get(ATTR_PERCENTAGE) == 100
+    assert "ramp_target" not in state.attributes
+    assert hass.states.get(mock_switch_entity_ids[0]).state == STATE_OFF
+    assert hass.states.get(mock_switch_entity_ids[1]).state == STATE_OFF
+    assert hass.states.get(mock_switch_entity_ids[2]).state == STATE_ON
+
+
+@pytest.mark.parametrize("config_entry_options", [{"ramp_interval": 5}])
+@pytest.mark.parametrize(
+    "mock_switch_entities",
+    [
+        [
+            MockSwitch("switch.low", STATE_OFF),
+            MockSwitch("switch.medium", STATE_OFF),
+            MockSwitch("switch.high", STATE_OFF),
+        ]
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_turn_off_cancels_ramp(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test turning off the fan cancels an in progress ramp."""
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 100},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: SWITCH_FAN},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_OFF
+    assert "ramp_target" not in state.attributes
+    assert all(
+        hass.states.get(entity_id).state == STATE_OFF
+        for entity_id in mock_switch_entity_ids
+    )
+
+
+@pytest.mark.parametrize("config_entry_options", [{"ramp_interval": 5}])
+@pytest.mark.parametrize(
+    "mock_switch_entities",
+    [
+        [
+            MockSwitch("switch.low", STATE_OFF),
+            MockSwitch("switch.medium", STATE_OFF),
+            MockSwitch("switch.high", STATE_OFF),
+        ]
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_failed_ramp_step_ends_ramp(
+    hass: HomeAssistant, mock_switch_entity_ids: list[str]
+) -> None:
+    """Test a ramp whose step fails is not reported as in progress."""
+    with (
+        patch.object(
+            SwitchFan,
+            "async_set_speed_index",
+            side_effect=HomeAssistantError("Relay offline"),
+        ),
+        pytest.raises(HomeAssistantError),
+    ):
+        await hass.services.async_call(
+            FAN_DOMAIN,
+            FAN_SERVICE_SET_PERCENTAGE,
+            {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 100},
+            blocking=True,
+        )
+    await hass.async_block_till_done()
+
+    assert "ramp_target" not in hass.states.get(SWITCH_FAN).attributes
+
+
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_set_timer(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test the fan turns off once its timer expires."""
+    await hass.services.async_call(
+        DOMAIN,
+        "set_timer",
+        {ATTR_ENTITY_ID: SWITCH_FAN, "duration": "00:30:00"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_ON
+    assert state.attributes.get("remaining") == "0:30:00"
+    assert state.attributes.get("finishes_at") is not None
+
+    freezer.tick(timedelta(minutes=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_OFF
+    assert "remaining" not in state.attributes
+    assert all(
+        hass.states.get(entity_id).state == STATE_OFF
+        for entity_id in mock_switch_entity_ids
+    )
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_expired_timer_writes_state(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+    setup_config_entry: MockConfigEntry,
+) -> None:
+    """Test an expired timer is cleared before the members report back."""
+    calls = async_mock_service(hass, SWITCH_DOMAIN, SWITCH_SERVICE_TURN_OFF)
+    await hass.services.async_call(
+        DOMAIN,
+        "set_timer",
+        {ATTR_ENTITY_ID: SWITCH_FAN, "duration": "00:30:00"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert "remaining" in hass.states.get(SWITCH_FAN).attributes
+
+    freezer.tick(timedelta(minutes=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    state = hass.states.get(SWITCH_FAN)
+    assert "remaining" not in state.attributes
+    assert "finishes_at" not in state.attributes
+
+    fan = hass.data[DOMAIN].fans[setup_config_entry.entry_id]
+    assert trace_commands(fan.trace.as_list())[-1] == {
+        "kind": "command",
+        "service": SWITCH_SERVICE_TURN_OFF,
+        "entity_ids": mock_switch_entity_ids,
+    }
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_expired_timers_are_coalesced(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test timers expiring together turn off their fans with one call."""
+    for name in ("Fan one", "Fan two"):
+        config_entry = MockConfigEntry(
+            data={},
+            domain=DOMAIN,
+            options={"entities": mock_switch_entity_ids, "name": name},
+            title=name,
+        )
+        config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        "set_timer",
+        {ATTR_ENTITY_ID: ["fan.fan_one", "fan.fan_two"], "duration": "00:30:00"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    freezer.tick(timedelta(minutes=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert [(call.data["domain"], call.data["service"]) for call in calls] == [
+        (SWITCH_DOMAIN, SWITCH_SERVICE_TURN_OFF)
+    ]
+    assert hass.states.get("fan.fan_one").state == STATE_OFF
+    assert hass.states.get("fan.fan_two").state == STATE_OFF
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_timer_restored_after_restart(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test a timer that expired while stopped turns the fan off on start."""
+    hass_storage["switch_fan.timers"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "switch_fan.timers",
+        "data": {"my_entry": dt_util.utcnow().timestamp() - 60},
+    }
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        entry_id="my_entry",
+        options={"entities": mock_switch_entity_ids, "name": "My switch fan"},
+        title="My switch fan",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(SWITCH_FAN).state == STATE_OFF
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_watchdog_corrects_missed_command(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entities: list[MockSwitch],
+    setup_config_entry: MockConfigEntry,
+) -> None:
+    """Test a command the member missed is reissued once its deadline passes."""
+    with patch.object(mock_switch_entities[1], "turn_on"):
+        await hass.services.async_call(
+            FAN_DOMAIN,
+            FAN_SERVICE_SET_PERCENTAGE,
+            {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 66},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    assert hass.states.get(SWITCH_FAN).attributes.get(ATTR_PERCENTAGE) == 0
+
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(SWITCH_FAN).attributes.get(ATTR_PERCENTAGE) == 66
+
+    diagnostics = await get_diagnostics_for_config_entry(
+        hass, hass_client, setup_config_entry
+    )
+    assert diagnostics["watchdog"] == {
+        "target": None,
+        "attempt": 1,
+        "drift_count": 1,
+        "correction_count": 1,
+        "failure_count": 0,
+    }
+
+
+@pytest.mark.parametrize(
+    "config_entry_options", [{"entities": ["light.dimmer"], "dimmer": True}]
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_dimmer(hass: HomeAssistant) -> None:
+    """Test the speed of a dimmer fan follows the brightness of its light."""
+    hass.states.async_set("light.dimmer", STATE_ON, {"brightness": 128})
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_ON
+    assert state.attributes.get(ATTR_PERCENTAGE) == 50
+    assert state.attributes.get("percentage_step") == 1
+
+    calls = async_mock_service(hass, "light", "turn_on")
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 75},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+    assert calls[0].data == {"entity_id": {"light.dimmer"}, "brightness": 192}
+
+    hass.states.async_set("light.dimmer", STATE_ON, {"brightness": 192})
+    await hass.async_block_till_done()
+    assert hass.states.get(SWITCH_FAN).attributes.get(ATTR_PERCENTAGE) == 75
+
+    hass.states.async_set("light.dimmer", STATE_OFF)
+    await hass.async_block_till_done()
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_OFF
+    assert state.attributes.get(ATTR_PERCENTAGE) == 0
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_TURN_ON,
+        {ATTR_ENTITY_ID: SWITCH_FAN},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert len(calls) == 2
+    assert calls[1].data == {"entity_id": {"light.dimmer"}}
+
+
+@pytest.mark.parametrize(
+    "config_entry_options",
+    [{"entities": ["light.dimmer"], "dimmer": True, "brightness_curve": 2.0}],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_dimmer_curve_settles(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a curved brightness is not corrected for rounding to another speed."""
+    hass.states.async_set("light.dimmer", STATE_OFF)
+
+    calls = async_mock_service(hass, "light", "turn_on")
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 2},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert calls[0].data == {"entity_id": {"light.dimmer"}, "brightness": 3}
+
+    # Brightness 3 reads back as 4%, which is still the commanded brightness
+    hass.states.async_set("light.dimmer", STATE_ON, {"brightness": 3})
+    await hass.async_block_till_done()
+    assert hass.states.get(SWITCH_FAN).attributes.get(ATTR_PERCENTAGE) == 4
+
+    freezer.tick(timedelta(seconds=60))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_trace_in_diagnostics(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    mock_switch_entity_ids: list[str],
+    setup_config_entry: MockConfigEntry,
+) -> None:
+    """Test the requests, commands and member events of a fan are traced."""
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 100},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    diagnostics = await get_diagnostics_for_config_entry(
+        hass, hass_client, setup_config_entry
+    )
+    trace = diagnostics["trace"]
+    assert trace[0] == {"time": 0.0, "kind": "request", "percentage": 100}
+    assert trace_commands(trace) == [
+        {
+            "kind": "command",
+            "service": "turn_on",
+            "entity_ids": [mock_switch_entity_ids[2]],
+        },
+        {
+            "kind": "command",
+            "service": "turn_off",
+            "entity_ids": mock_switch_entity_ids[:2],
+        },
+    ]
+    events = [
+        (entry["entity_id"], entry["state"])
+        for entry in trace
+        if entry["kind"] == "event"
+    ]
+    assert (mock_switch_entity_ids[0], STATE_OFF) in events
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_replay_trace(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test replaying a trace of overlapping commands and a missed command.
+
+    The medium relay reports the first command late and misses the second,
+    which the watchdog corrects once its deadline passes.
+    """
+    trace = [
+        {"time": 0.0, "kind": "request", "percentage": 66},
+        {
+            "time": 0.0,
+            "kind": "command",
+            "service": "turn_on",
+            "entity_ids": ["switch.medium"],
+        },
+        {
+            "time": 0.0,
+            "kind": "command",
+            "service": "turn_off",
+            "entity_ids": ["switch.low", "switch.high"],
+        },
+        {"time": 0.2, "kind": "request", "percentage": 100},
+        {
+            "time": 0.2,
+            "kind": "command",
+            "service": "turn_on",
+            "entity_ids": ["switch.high"],
+        },
+        {
+            "time": 0.2,
+            "kind": "command",
+            "service": "turn_off",
+            "entity_ids": ["switch.low", "switch.medium"],
+        },
+        {"time": 0.3, "kind": "event", "entity_id": "switch.medium", "state": "on"},
+        {"time": 0.4, "kind": "event", "entity_id": "switch.high", "state": "on"},
+        {
+            "time": 5.2,
+            "kind": "command",
+            "service": "turn_off",
+            "entity_ids": ["switch.medium"],
+        },
+        {"time": 5.5, "kind": "event", "entity_id": "switch.medium", "state": "off"},
+    ]
+
+    report = await async_replay(
+        hass, freezer, trace, ["switch.low", "switch.medium", "switch.high"]
+    )
+
+    assert report.commands == trace_commands(trace)
+    assert report.percentage == 100
+    # The late report shows the fan at 66% until the correction takes effect
+    assert report.state_writes == 2
+
+
+@pytest.mark.usefixtures("setup_hass")
+async def test_replay_dimmer_turn_on(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test replaying a plain turn on, which is not a percentage request."""
+    trace = [
+        {"time": 0.0, "kind": "request", "service": "turn_on"},
+        {
+            "time": 0.0,
+            "kind": "command",
+            "service": "turn_on",
+            "entity_ids": ["light.dimmer"],
+        },
+        {
+            "time": 0.3,
+            "kind": "event",
+            "entity_id": "light.dimmer",
+            "state": "on",
+            "brightness": 128,
+        },
+    ]
+
+    report = await async_replay(
+        hass, freezer, trace, ["light.dimmer"], {"dimmer": True}
+    )
+
+    assert report.commands == trace_commands(trace)
+    assert report.percentage == 50
+
+
+@pytest.mark.parametrize(
+    "config_entry_options",
+    [
+        {
+            "auto_sensor": "sensor.temperature",
+            "auto_thresholds": "24,27,30",
+            "auto_hysteresis": 1,
+        }
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_auto_preset(
+    hass: HomeAssistant, mock_switch_entity_ids: list[str]
+) -> None:
+    """Test the auto preset follows the bands of the source sensor."""
+    hass.states.async_set("sensor.temperature", "20")
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_PRESET_MODES] == ["auto"]
+    assert state.attributes[ATTR_PRESET_MODE] is None
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PRESET_MODE: "auto"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_OFF
+    assert state.attributes[ATTR_PRESET_MODE] == "auto"
+
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    for value, percentage in (
+        ("25", 33),
+        ("26", 33),
+        ("27.5", 66),
+        # Within the hysteresis of the threshold
+        ("26.5", 66),
+        ("unavailable", 66),
+        ("25.9", 33),
+    ):
+        hass.states.async_set("sensor.temperature", value)
+        await hass.async_block_till_done()
+        assert hass.states.get(SWITCH_FAN).attributes[ATTR_PERCENTAGE] == percentage
+
+    # Only the band changes sent commands
+    assert [
+        call.data["service"] for call in calls if call.data["domain"] == SWITCH_DOMAIN
+    ] == ["turn_on", "turn_off"] * 3
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 100},
+        blocking=True,
+    )
+    hass.states.async_set("sensor.temperature", "20")
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_PRESET_MODE] is None
+    assert state.attributes[ATTR_PERCENTAGE] == 100
+
+
+@pytest.mark.parametrize(
+    "config_entry_options",
+    [
+        {
+            "ramp_interval": 5,
+            "auto_sensor": "sensor.temperature",
+            "auto_thresholds": "24,27,30",
+        }
+    ],
+)
+@pytest.mark.parametrize(
+    "mock_switch_entities",
+    [
+        [
+            MockSwitch("switch.low", STATE_OFF),
+            MockSwitch("switch.medium", STATE_OFF),
+            MockSwitch("switch.high", STATE_OFF),
+        ]
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_auto_preset_cancels_ramp(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test entering auto mode stops an in progress ramp."""
+    hass.states.async_set("sensor.temperature", "25")
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 100},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get(SWITCH_FAN).attributes["ramp_target"] == 100
+
+    # The sensor's band has the speed the ramp is at, so auto sends nothing
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PRESET_MODE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PRESET_MODE: "auto"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_PRESET_MODE] == "auto"
+    assert state.attributes[ATTR_PERCENTAGE] == 33
+    assert "ramp_target" not in state.attributes
+
+
+@pytest.mark.parametrize("config_entry_options", [{"speed_curve": "20,45,100"}])
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_speed_curve(
+    hass: HomeAssistant, mock_switch_entity_ids: list[str]
+) -> None:
+    """Test percentages follow the airflow of each speed."""
+    assert hass.states.get(SWITCH_FAN).attributes[ATTR_PERCENTAGE] == 20
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_PERCENTAGE,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 30},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(SWITCH_FAN).attributes[ATTR_PERCENTAGE] == 45
+    assert [
+        hass.states.get(entity_id).state for entity_id in mock_switch_entity_ids
+    ] == [STATE_OFF, STATE_ON, STATE_OFF]
+
+    # Stepping moves one speed along the curve, not a third of the range
+    for service, percentage in (
+        (FAN_SERVICE_INCREASE_SPEED, 100),
+        (FAN_SERVICE_DECREASE_SPEED, 45),
+        (FAN_SERVICE_DECREASE_SPEED, 20),
+        (FAN_SERVICE_DECREASE_SPEED, 0),
+    ):
+        await hass.services.async_call(
+            FAN_DOMAIN, service, {ATTR_ENTITY_ID: SWITCH_FAN}, blocking=True
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get(SWITCH_FAN).attributes[ATTR_PERCENTAGE] == percentage
+
+    await hass.services.async_call(
+        FAN_DOMAIN, FAN_SERVICE_TURN_ON, {ATTR_ENTITY_ID: SWITCH_FAN}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get(SWITCH_FAN).attributes[ATTR_PERCENTAGE] == 20
+
+
+@pytest.mark.parametrize(
+    "config_entry_options",
+    [
+        {
+            "direction_entity": "input_boolean.reverse",
+            "oscillation_entity": "input_boolean.oscillate",
+        }
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_reverse_stops_before_changing_direction(
+    hass: HomeAssistant, mock_switch_entity_ids: list[str]
+) -> None:
+    """Test reversing at a speed is sent as ordered, batched steps."""
+    assert await async_setup_component(
+        hass, "input_boolean", {"input_boolean": {"reverse": {}, "oscillate": {}}}
+    )
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_DIRECTION] == DIRECTION_FORWARD
+    assert state.attributes[ATTR_OSCILLATING] is False
+
+    calls = async_capture_events(hass, EVENT_CALL_SERVICE)
+    await hass.services.async_call(
+        DOMAIN,
+        "set_motion",
+        {
+            ATTR_ENTITY_ID: SWITCH_FAN,
+            ATTR_PERCENTAGE: 66,
+            ATTR_DIRECTION: DIRECTION_REVERSE,
+            ATTR_OSCILLATING: True,
+        },
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    member_calls = [
+        (call.data["domain"], call.data["service"], call.data["service_data"])
+        for call in calls
+        if call.data["domain"] in (SWITCH_DOMAIN, "input_boolean")
+    ]
+    assert member_calls == [
+        # The fan is stopped first
+        (SWITCH_DOMAIN, "turn_off", {ATTR_ENTITY_ID: set(mock_switch_entity_ids)}),
+        # Then reversed, together with the oscillation
+        (
+            "input_boolean",
+            "turn_on",
+            {ATTR_ENTITY_ID: {"input_boolean.reverse", "input_boolean.oscillate"}},
+        ),
+        # And restarted at the new speed
+        (SWITCH_DOMAIN, "turn_on", {ATTR_ENTITY_ID: {mock_switch_entity_ids[1]}}),
+        (
+            SWITCH_DOMAIN,
+            "turn_off",
+            {ATTR_ENTITY_ID: {mock_switch_entity_ids[0], mock_switch_entity_ids[2]}},
+        ),
+    ]
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_DIRECTION] == DIRECTION_REVERSE
+    assert state.attributes[ATTR_OSCILLATING] is True
+    assert state.attributes[ATTR_PERCENTAGE] == 66
+
+    calls.clear()
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: SWITCH_FAN},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_DIRECTION,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_DIRECTION: DIRECTION_FORWARD},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    # A stopped fan changes direction without restarting
+    assert [
+        (call.data["domain"], call.data["service"])
+        for call in calls
+        if call.data["domain"] in (SWITCH_DOMAIN, "input_boolean")
+    ] == [(SWITCH_DOMAIN, "turn_off"), ("input_boolean", "turn_off")]
+    assert hass.states.get(SWITCH_FAN).attributes[ATTR_DIRECTION] == DIRECTION_FORWARD
+
+
+@pytest.mark.parametrize(
+    "config_entry_options",
+    [{"ramp_interval": 5, "direction_entity": "input_boolean.reverse"}],
+)
+@pytest.mark.parametrize(
+    "mock_switch_entities",
+    [
+        [
+            MockSwitch("switch.low", STATE_OFF),
+            MockSwitch("switch.medium", STATE_OFF),
+            MockSwitch("switch.high", STATE_ON),
+        ]
+    ],
+)
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_reverse_with_ramp(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test reversing with a ramp interval ramps back up to the previous speed."""
+    assert await async_setup_component(
+        hass, "input_boolean", {"input_boolean": {"reverse": {}}}
+    )
+
+    await hass.services.async_call(
+        FAN_DOMAIN,
+        FAN_SERVICE_SET_DIRECTION,
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_DIRECTION: DIRECTION_REVERSE},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_DIRECTION] == DIRECTION_REVERSE
+    assert state.attributes[ATTR_PERCENTAGE] == 33
+    assert state.attributes.get("ramp_target") == 100
+
+    freezer.tick(timedelta(seconds=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.attributes[ATTR_PERCENTAGE] == 100
+    assert "ramp_target" not in state.attributes
+    assert hass.states.get(mock_switch_entity_ids[2]).state == STATE_ON
+
+
+@pytest.mark.usefixtures("setup_hass")
+@pytest.mark.usefixtures("setup_config_entry")
+async def test_set_motion_off_cancels_timer(hass: HomeAssistant) -> None:
+    """Test stopping the fan with set_motion cancels its timer."""
+    await hass.services.async_call(
+        DOMAIN,
+        "set_timer",
+        {ATTR_ENTITY_ID: SWITCH_FAN, "duration": "00:30:00"},
+        blocking=True,
+    )
+    await hass.services.async_call(
+        DOMAIN,
+        "set_motion",
+        {ATTR_ENTITY_ID: SWITCH_FAN, ATTR_PERCENTAGE: 0},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get(SWITCH_FAN)
+    assert state.state == STATE_OFF
+    assert "remaining" not in state.attributes
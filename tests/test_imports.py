@@ -0,0 +1,74 @@
+"""Test the import cost of the Switch Fan integration."""
+
+from collections.abc import Callable
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Budget for importing the integration on top of the fan component, which
+# Home Assistant loads regardless of whether any switch fans are configured.
+# The import time is only reported, as wall-clock time is too noisy to
+# assert on, while the modules imported are deterministic.
+MAX_NEW_MODULES = 10
+
+IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+import homeassistant.components.fan  # noqa: F401
+import homeassistant.helpers.device  # noqa: F401
+
+before = set(sys.modules)
+start = time.perf_counter()
+for module in sys.argv[1:]:
+    __import__(module)
+elapsed = time.perf_counter() - start
+
+print(json.dumps({"elapsed": elapsed, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+def _measure_import(*modules: str) -> dict:
+    """Import modules in a fresh interpreter and report their cost."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT, *modules],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_budget(record_property: Callable[[str, object], None]) -> None:
+    """Test importing the integration stays within its module budget."""
+    measurement = _measure_import(
+        "homeassistant.components.switch_fan",
+        "homeassistant.components.switch_fan.fan",
+    )
+
+    record_property("import_time", round(measurement["elapsed"], 4))
+    record_property("import_modules", len(measurement["modules"]))
+    assert len(measurement["modules"]) <= MAX_NEW_MODULES
+
+
+def test_setup_path_does_not_import_config_flow() -> None:
+    """Test the flow-only modules are not imported to set up a switch fan."""
+    measurement = _measure_import(
+        "homeassistant.components.switch_fan",
+        "homeassistant.components.switch_fan.fan",
+    )
+
+    modules = measurement["modules"]
+    assert "homeassistant.components.switch_fan.config_flow" not in modules
+    assert "homeassistant.helpers.schema_config_entry_flow" not in modules
+
+
+@pytest.mark.parametrize("component", ["input_boolean", "light", "switch"])
+def test_config_flow_does_not_import_member_components(component: str) -> None:
+    """Test member components are not imported just for their domain names."""
+    measurement = _measure_import("homeassistant.components.switch_fan.config_flow")
+
+    assert f"homeassistant.components.{component}" not in measurement["modules"]
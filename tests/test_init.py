@@ -1,11 +1,19 @@
 """Test the Switch Fan integration."""
 
+import asyncio
+from pathlib import Path
+import tracemalloc
+from unittest.mock import patch
+
 import pytest
+import voluptuous as vol
 
 from homeassistant.components.fan import FanEntityFeature
+from homeassistant.components.switch_fan.fan import SwitchFan
 from homeassistant.components.switch_fan.const import DOMAIN
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.setup import async_setup_component
 
 from tests.common import MockConfigEntry
 
@@ -59,6 +67,84 @@ async def test_setup_and_remove_config_entry(
     assert entity_registry.async_get(switch_fan_entity_id) is None
 
 
+async def test_profile(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test profiling writes a report of the hot paths and then uninstalls."""
+    percentage = SwitchFan.percentage
+    hass.states.async_set("switch.low", "off")
+    hass.states.async_set("switch.high", "off")
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        options={"entities": ["switch.low", "switch.high"], "name": "My switch fan"},
+        title="My switch fan",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    report_path = tmp_path / "profile.txt"
+    with patch.object(hass.config, "path", return_value=str(report_path)):
+        task = hass.async_create_task(
+            hass.services.async_call(
+                DOMAIN,
+                "profile",
+                {"seconds": 1, "trace_allocations": True},
+                blocking=True,
+            )
+        )
+        await asyncio.sleep(0.2)
+        hass.states.async_set("switch.low", "on")
+        await task
+
+    assert hass.states.get("fan.my_switch_fan").state == "on"
+    report = report_path.read_text()
+    calls = {
+        line.split()[0]: int(line.split()[1])
+        for line in report.splitlines()
+        if line.startswith(("async_", "call_service", "percentage"))
+    }
+    assert calls["async_update_event_state_callback"] == 1
+    assert calls["percentage"] > 0
+    assert calls["async_set_percentage"] == 0
+    assert "Allocations" in report
+
+    # The instrumentation is removed once profiling stops
+    assert SwitchFan.percentage is percentage
+
+
+async def test_cancelled_profile_stops_tracing(hass: HomeAssistant) -> None:
+    """Test cancelling a profile stops the allocation tracing it started."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+    assert not tracemalloc.is_tracing()
+
+    task = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            "profile",
+            {"seconds": 60, "trace_allocations": True},
+            blocking=True,
+        )
+    )
+    await asyncio.sleep(0.2)
+    assert tracemalloc.is_tracing()
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not tracemalloc.is_tracing()
+
+
+async def test_profile_rejects_zero_seconds(hass: HomeAssistant) -> None:
+    """Test the profile service needs at least a second, as its form does."""
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(DOMAIN, "profile", {"seconds": 0}, blocking=True)
+
+
 # @pytest.mark.skip
 # @pytest.mark.parametrize(("count", "domain"), [(1, "switch")])
 # @pytest.mark.parametrize(
@@ -180,3 +266,41 @@ async def test_setup_and_remove_config_entry(
 #         dr.async_entries_for_config_entry(device_registry, fan_config_entry.entry_id)
 #         == []
 #     )
+
+
+async def test_setup_many_entries(hass: HomeAssistant) -> None:
+    """Test setting up many entries does no redundant work per entry.
+
+    The work is counted rather than timed, as setup time on a test runner
+    is too noisy to assert on.
+    """
+    for fan in range(50):
+        MockConfigEntry(
+            data={},
+            domain=DOMAIN,
+            options={
+                "entities": [f"switch.fan_{fan}_low", f"switch.fan_{fan}_high"],
+                "name": f"Fan {fan}",
+            },
+            title=f"Fan {fan}",
+        ).add_to_hass(hass)
+
+    with (
+        patch(
+            "homeassistant.components.switch_fan.async_remove_stale_devices_links_keep_current_device"
+        ) as mock_remove_stale_devices_links,
+        patch.object(
+            SwitchFan,
+            "async_write_ha_state",
+            autospec=True,
+            side_effect=SwitchFan.async_write_ha_state,
+        ) as mock_write_ha_state,
+    ):
+        assert await async_setup_component(hass, DOMAIN, {})
+        await hass.async_block_till_done()
+
+    assert len(hass.states.async_entity_ids("fan")) == 50
+    # Device links are only cleaned up when the options change
+    mock_remove_stale_devices_links.assert_not_called()
+    # Each fan writes its state once, when the platform adds it
+    assert mock_write_ha_state.call_count == 50
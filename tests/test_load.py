@@ -0,0 +1,89 @@
+"""Load tests for switch fans backed by simulated relays."""
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+
+from .simulation import LoadHarness, RelayProfile
+
+
+def _expected_service_calls(waves: list[list[tuple[int, int]]]) -> int:
+    """Return the member service calls the commands take without retries.
+
+    Turning off takes one switch.turn_off call, setting a speed takes a
+    switch.turn_on and a switch.turn_off call.
+    """
+    return sum(1 if percentage == 0 else 2 for wave in waves for _, percentage in wave)
+
+
+async def test_command_storm(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a storm of commands across hundreds of fans settles quickly."""
+    harness = LoadHarness(
+        hass,
+        freezer,
+        fan_count=200,
+        speed_count=3,
+        profile=RelayProfile(latency=0.05, jitter=0.05, report_delay=0.02),
+    )
+    await harness.async_setup()
+    waves = harness.random_storm(waves=5, commands=100)
+
+    report = await harness.async_run(waves)
+
+    assert report.unsettled == 0
+    assert len(report.latencies) == 500
+    assert report.p50 <= 0.2
+    assert report.p99 <= 0.5
+    assert report.service_calls == _expected_service_calls(waves)
+    assert report.state_writes > 0
+
+
+async def test_batched_command_storm(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test fans batching commands merge the member calls of a storm."""
+    harness = LoadHarness(
+        hass,
+        freezer,
+        fan_count=200,
+        speed_count=3,
+        profile=RelayProfile(latency=0.05, jitter=0.05, report_delay=0.02),
+        batch_commands=True,
+    )
+    await harness.async_setup()
+    waves = harness.random_storm(waves=5, commands=100)
+
+    report = await harness.async_run(waves)
+
+    assert report.unsettled == 0
+    assert len(report.latencies) == 500
+    assert report.p99 <= 0.5
+    # One turn_on and one turn_off for the speed changes of each wave, and
+    # one turn_off for the fans turned off
+    assert report.service_calls <= 3 * len(waves)
+    assert _expected_service_calls(waves) > 100 * len(waves)
+
+
+async def test_dropped_commands_settle(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test fans settle when relays drop commands."""
+    harness = LoadHarness(
+        hass,
+        freezer,
+        fan_count=50,
+        speed_count=3,
+        profile=RelayProfile(latency=0.05, jitter=0.05, drop_rate=0.1),
+    )
+    await harness.async_setup()
+    waves = harness.random_storm(waves=2, commands=50)
+
+    report = await harness.async_run(waves)
+
+    assert report.unsettled == 0
+    assert sum(relay.dropped for relays in harness.relays for relay in relays) > 0
+    # The watchdog reissued the dropped commands once their deadline passed
+    assert report.service_calls > _expected_service_calls(waves)
+    assert max(report.latencies) >= 5
@@ -0,0 +1,180 @@
+"""Test the member helpers of switch fans."""
+
+import asyncio
+from collections.abc import Callable
+import gc
+import tracemalloc
+
+import pytest
+
+from homeassistant.components.switch_fan.members import (
+    MemberCommandBatcher,
+    MemberStates,
+    group_by_domain,
+)
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceNotFound
+
+from tests.common import async_mock_service
+
+FAN_COUNT = 1000
+SPEED_COUNT = 3
+
+
+def _fan_entity_ids() -> list[list[str]]:
+    """Return the member entity IDs of each fan, as loaded from the options."""
+    return [
+        [f"switch.fan_{fan % 100}_speed_{speed}" for speed in range(SPEED_COUNT)]
+        for fan in range(FAN_COUNT)
+    ]
+
+
+def _footprint(build) -> float:
+    """Return the memory allocated per fan by build."""
+    fan_entity_ids = _fan_entity_ids()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        fans = [build(entity_ids) for entity_ids in fan_entity_ids]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    assert len(fans) == FAN_COUNT
+    return size / FAN_COUNT
+
+
+def _legacy_members(entity_ids: list[str]) -> tuple[list[str], dict[str, str]]:
+    """Build the list and dict a fan used to keep for its members."""
+    return list(entity_ids), {entity_id: STATE_OFF for entity_id in entity_ids}
+
+
+def _compact_members(entity_ids: list[str]) -> MemberStates:
+    """Build the compact member states of a fan."""
+    members = MemberStates(entity_ids)
+    members.states.extend(bytes(len(entity_ids)))
+    return members
+
+
+def test_memory_footprint(record_property: Callable[[str, object], None]) -> None:
+    """Test the compact member states take less memory per fan."""
+    legacy = _footprint(_legacy_members)
+    compact = _footprint(_compact_members)
+
+    record_property("member_bytes_per_fan_before", round(legacy))
+    record_property("member_bytes_per_fan_after", round(compact))
+    assert compact < legacy
+
+
+async def test_member_states(hass: HomeAssistant) -> None:
+    """Test member states are read and updated in place."""
+    hass.states.async_set("switch.low", STATE_OFF)
+    hass.states.async_set("switch.high", STATE_ON)
+    members = MemberStates(["switch.low", "switch.medium", "switch.high"])
+    assert members.active_speed() is None
+
+    members.refresh(hass.states)
+    states = members.states
+    assert members.active_speed() == 3
+    assert members.is_only_on(3)
+    assert members.as_dict() == {
+        "switch.low": STATE_OFF,
+        "switch.medium": None,
+        "switch.high": STATE_ON,
+    }
+
+    members.set("switch.low", STATE_ON)
+    members.set("switch.high", STATE_UNAVAILABLE)
+    assert members.states is states
+    assert members.active_speed() == 1
+    assert members.is_only_on(1)
+    assert not members.is_only_on(0)
+
+    members.set("switch.low", STATE_OFF)
+    assert members.active_speed() == 0
+    assert members.is_only_on(0)
+
+
+def test_members_are_shared() -> None:
+    """Test fans controlling the same entity share its member record."""
+    first = MemberStates(["switch.low", "light.high"])
+    second = MemberStates([f"switch.{'low'}", "switch.high"])
+
+    assert first.members[0] is second.members[0]
+    assert first.entity_ids == ("switch.low", "light.high")
+    assert first.entity_ids is first.entity_ids
+
+
+def test_group_by_domain() -> None:
+    """Test members and other entities are grouped by their domain."""
+    members = MemberStates(["switch.low", "light.high"])
+
+    assert group_by_domain([*members.entity_ids, "switch.reverse"]) == {
+        "switch": {"switch.low", "switch.reverse"},
+        "light": {"light.high"},
+    }
+
+
+async def test_commands_are_batched(hass: HomeAssistant) -> None:
+    """Test calls made in the same loop tick are merged by domain and service."""
+    turn_on = async_mock_service(hass, "switch", SERVICE_TURN_ON)
+    turn_off = async_mock_service(hass, "switch", SERVICE_TURN_OFF)
+    light_on = async_mock_service(hass, "light", SERVICE_TURN_ON)
+    batcher = MemberCommandBatcher(hass)
+
+    await asyncio.gather(
+        batcher.async_call(SERVICE_TURN_ON, ["switch.one_low"]),
+        batcher.async_call(SERVICE_TURN_ON, ["switch.two_low", "light.two"]),
+        batcher.async_call(SERVICE_TURN_OFF, ["switch.three_low"]),
+        batcher.async_call(SERVICE_TURN_ON, ["light.one"], {"brightness": 128}),
+    )
+    await hass.async_block_till_done()
+
+    assert len(turn_on) == 1
+    assert turn_on[0].data[ATTR_ENTITY_ID] == {"switch.one_low", "switch.two_low"}
+    assert len(turn_off) == 1
+    assert [call.data for call in light_on] == [
+        {ATTR_ENTITY_ID: {"light.two"}},
+        {ATTR_ENTITY_ID: {"light.one"}, "brightness": 128},
+    ]
+
+
+async def test_batched_command_errors(hass: HomeAssistant) -> None:
+    """Test only the callers of a failed call get its error."""
+    turn_on = async_mock_service(hass, "switch", SERVICE_TURN_ON)
+    batcher = MemberCommandBatcher(hass)
+
+    results = await asyncio.gather(
+        batcher.async_call(SERVICE_TURN_ON, ["switch.one"]),
+        batcher.async_call(SERVICE_TURN_ON, ["switch.two", "light.two"]),
+        return_exceptions=True,
+    )
+    await hass.async_block_till_done()
+
+    assert results[0] is None
+    assert isinstance(results[1], ServiceNotFound)
+    assert len(turn_on) == 1
+    with pytest.raises(ServiceNotFound):
+        await batcher.async_call(SERVICE_TURN_ON, ["light.three"])
+
+
+async def test_batched_errors_in_every_domain(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a caller failing in several domains leaves no error unretrieved."""
+    batcher = MemberCommandBatcher(hass)
+
+    with pytest.raises(ServiceNotFound):
+        await batcher.async_call(SERVICE_TURN_ON, ["light.one", "input_boolean.two"])
+    await hass.async_block_till_done()
+    gc.collect()
+
+    assert "exception was never retrieved" not in caplog.text
@@ -0,0 +1,109 @@
+"""The tests for the switch fan runtime sensors."""
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.switch import (
+    DOMAIN as SWITCH_DOMAIN,
+    SERVICE_TURN_OFF as SWITCH_SERVICE_TURN_OFF,
+)
+from homeassistant.components.switch_fan.accumulator import CHECKPOINT_INTERVAL
+from homeassistant.components.switch_fan.const import DOMAIN
+from homeassistant.const import ATTR_ENTITY_ID, STATE_OFF
+from homeassistant.core import HomeAssistant
+
+from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.components.switch.common import MockSwitch
+
+
+@pytest.mark.parametrize(
+    "mock_switch_entities",
+    [
+        [
+            MockSwitch("switch.low", STATE_OFF),
+            MockSwitch("switch.medium", STATE_OFF),
+            MockSwitch("switch.high", STATE_OFF),
+        ]
+    ],
+)
+@pytest.mark.usefixtures("entity_registry_enabled_by_default")
+async def test_runtime_and_energy(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    freezer: FrozenDateTimeFactory,
+    mock_switch_entity_ids: list[str],
+) -> None:
+    """Test runtime and energy accumulate for the speed the fan ran at."""
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        entry_id="my_entry",
+        options={
+            "entities": mock_switch_entity_ids,
+            "name": "My switch fan",
+            "speed_watts": "20, 40, 60",
+        },
+        title="My switch fan",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.my_switch_fan_speed_2_runtime").state) == 0
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        "turn_on",
+        {ATTR_ENTITY_ID: "switch.medium"},
+        blocking=True,
+    )
+    freezer.tick(timedelta(hours=2))
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SWITCH_SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: "switch.medium"},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.my_switch_fan_speed_1_runtime").state) == 0
+    assert float(hass.states.get("sensor.my_switch_fan_speed_2_runtime").state) == 2
+    assert float(hass.states.get("sensor.my_switch_fan_speed_2_energy").state) == 0.08
+
+    freezer.tick(CHECKPOINT_INTERVAL)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass_storage["switch_fan.runtime"]["data"] == {
+        "my_entry": [0.0, 7200.0, 0.0]
+    }
+
+
+async def test_runtime_restored(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    entity_registry_enabled_by_default: None,
+) -> None:
+    """Test runtime is restored from storage."""
+    hass_storage["switch_fan.runtime"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "switch_fan.runtime",
+        "data": {"my_entry": [3600.0, 7200.0]},
+    }
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        entry_id="my_entry",
+        options={"entities": ["switch.low", "switch.high"], "name": "My switch fan"},
+        title="My switch fan",
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.my_switch_fan_speed_1_runtime").state) == 1
+    assert float(hass.states.get("sensor.my_switch_fan_speed_2_runtime").state) == 2
+    assert hass.states.get("sensor.my_switch_fan_speed_1_energy") is None
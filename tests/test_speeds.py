@@ -0,0 +1,66 @@
+"""Test the speed lookup tables of switch fans."""
+
+import math
+
+import pytest
+
+from homeassistant.components.switch_fan.speeds import (
+    AutoBands,
+    SpeedCurve,
+    parse_speed_curve,
+    parse_thresholds,
+)
+from homeassistant.util.percentage import percentage_to_ranged_value
+
+
+@pytest.mark.parametrize("speed_count", [1, 2, 3, 4, 5, 7, 100])
+def test_linear_curve(speed_count: int) -> None:
+    """Test the linear curve matches the evenly spaced speed conversion."""
+    curve = SpeedCurve.linear(speed_count)
+
+    assert curve.speed(0) == 0
+    for percentage in range(1, 101):
+        assert curve.speed(percentage) == math.ceil(
+            percentage_to_ranged_value((1, speed_count), percentage)
+        )
+    assert curve.percentage(speed_count) == 100
+
+
+def test_speed_curve() -> None:
+    """Test a percentage selects the slowest speed delivering it."""
+    curve = SpeedCurve(parse_speed_curve("20,45,90"))
+
+    assert [curve.speed(percentage) for percentage in (1, 20, 21, 45, 46, 100)] == [
+        1,
+        1,
+        2,
+        2,
+        3,
+        3,
+    ]
+    assert [curve.percentage(speed) for speed in range(4)] == [0, 20, 45, 90]
+
+
+@pytest.mark.parametrize("value", ["20,hot", "45,20", "0,50", "20,120", "20.5,100"])
+def test_invalid_speed_curve(value: str) -> None:
+    """Test speed curves must be ascending whole percentages."""
+    with pytest.raises(ValueError):
+        parse_speed_curve(value)
+
+
+def test_auto_bands() -> None:
+    """Test the bands only fall back once past the hysteresis."""
+    bands = AutoBands(parse_thresholds("24,27,30"), speed_count=3, hysteresis=1)
+
+    assert bands.speeds == (0, 1, 2, 3)
+    assert bands.band(20, None) == 0
+    assert bands.band(27, 1) == 2
+    assert bands.band(26.5, 2) == 2
+    assert bands.band(25.9, 2) == 1
+    assert bands.band(31, 1) == 3
+
+
+def test_auto_bands_spread_over_speeds() -> None:
+    """Test fewer bands than speeds are spread evenly over them."""
+    assert AutoBands([24, 27], speed_count=100).speeds == (0, 50, 100)
+    assert AutoBands([24, 27], speed_count=3).speeds == (0, 1, 3)